@@ -0,0 +1,127 @@
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# NOTE(mmacieje): Measures `HostExecutor`'s own overhead, i.e. everything it
+# does on top of the engine, against the stand-in `unreal` module next to this
+# file. Numbers are only comparable with numbers taken on the same machine;
+# keep a baseline around and compare against it after changing the executor.
+#
+#     python Benchmarks/bench_executor.py --sizes 1 10 100 1000 --output baseline.json
+#
+
+BENCHMARKS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS_DIR), "Content", "Python"))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import unreal  # noqa: E402
+import host_executor  # noqa: E402
+
+COMMAND_LINE: str = "/Game/Maps/Benchmark Project.uproject -ExecCmds=\"py kickoff.py\" -Sequence=/Game/Shots/Shot.Shot -DeferredPass=Base -Width=2560 -Height=1440 -FrameRate=30 -Materials=PostProcessInput2 -SpatialSampleCount=2 -TemporalSampleCount=32 -StartFrame=0 -EndFrame=100 -Multilayer"
+
+MAP_COUNT: int = 4
+
+
+def measure(function: Callable[[], Any], repeat_count: int) -> Dict[str, float]:
+    timings: List[float] = []
+    for _ in range(repeat_count):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return {"min": min(timings), "median": statistics.median(timings), "max": max(timings)}
+
+
+def write_manifest(path: str, job_count: int) -> None:
+    # mmacieje: A synthetic batch spread over a handful of maps, interleaved
+    # so that scheduling has something to do.
+    jobs = [
+        {
+            "Sequence": f"/Game/Shots/Shot_{job_idx:04d}.Shot_{job_idx:04d}",
+            "Map": f"/Game/Maps/Map_{job_idx % MAP_COUNT}",
+            "Width": 1920,
+            "Height": 1080,
+            "TemporalSampleCount": 8,
+            "Materials": "PostProcessInput2",
+            "StartFrame": 0,
+            "EndFrame": 48,
+        }
+        for job_idx in range(job_count)
+    ]
+    with open(path, "w") as manifest_file:
+        json.dump({"jobs": jobs}, manifest_file)
+
+
+def new_executor() -> Any:
+    return host_executor.HostExecutor()
+
+
+def bench_parse_command_line(repeat_count: int) -> Dict[str, float]:
+    def parse() -> None:
+        _tokens, switches, args = unreal.SystemLibrary.parse_command_line(COMMAND_LINE)
+        host_executor.parse_job_parameters(switches, args)
+
+    return measure(parse, repeat_count)
+
+
+def bench_construct_queue(manifest_path: str, repeat_count: int) -> Dict[str, float]:
+    _tokens, switches, args = unreal.SystemLibrary.parse_command_line(f"-Manifest={manifest_path}")
+    executor = new_executor()
+    return measure(lambda: executor.construct_queue(switches, args), repeat_count)
+
+
+def bench_start_jobs(manifest_path: str, repeat_count: int) -> Dict[str, float]:
+    _tokens, switches, args = unreal.SystemLibrary.parse_command_line(f"-Manifest={manifest_path}")
+    executor = new_executor()
+    executor.construct_queue(switches, args)
+
+    # mmacieje: The stand-in PIE executor never finishes on its own, so jobs
+    # are started one after another by hand.
+    def start_jobs() -> None:
+        for job_idx in range(len(executor.job_order)):
+            executor.start_job_by_index(job_idx)
+
+    return measure(start_jobs, repeat_count)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure HostExecutor overhead against a stand-in `unreal` module.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="queue sizes, in jobs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="", help="write results here as JSON rather than to standard output")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"python": sys.version.split()[0], "repeat": args.repeat, "parse_command_line": bench_parse_command_line(args.repeat * 100), "queues": []}
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        unreal.saved_dir = os.path.join(temporary_dir, "Saved")
+        for size in args.sizes:
+            manifest_path = os.path.join(temporary_dir, f"manifest_{size}.json")
+            write_manifest(manifest_path, size)
+
+            construct_queue = bench_construct_queue(manifest_path, args.repeat)
+            start_jobs = bench_start_jobs(manifest_path, args.repeat)
+            results["queues"].append({
+                "jobs": size,
+                "construct_queue": construct_queue,
+                "construct_queue_per_job": construct_queue["median"] / size,
+                "start_jobs": start_jobs,
+                "start_job_per_job": start_jobs["median"] / size,
+            })
+            print(f"{size:6d} job(s): construct_queue {construct_queue['median'] * 1000:9.3f}ms, start_job_by_index {start_jobs['median'] / size * 1000:7.3f}ms/job", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+from typing import Any, Dict, List, Optional
+import argparse
+import glob
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# NOTE(mmacieje): Renders the same Sequence once per combination of resolution,
+# spatial and temporal sample counts, deferred pass and console variables with
+# a real editor, and reports throughput and peak memory of each as a line of
+# JSON. Numbers come from the summaries `-Telemetry` writes (see
+# `telemetry.py`), so they cover rendering only, not editor startup.
+#
+#     python Benchmarks/bench_matrix.py --editor path/to/UnrealEditor-Cmd.exe --project path/to/Project.uproject --map /Game/Maps/Map --sequence /Game/Shots/Shot.Shot --resolutions 1920x1080 3840x2160 --spatial 1 4 --temporal 1 8 --passes Base LightingOnly --cvars "" "r.Nanite=1" --output results.jsonl
+#
+
+
+def run_combination(args: argparse.Namespace, combination: Dict[str, Any], telemetry_directory: str) -> Dict[str, Any]:
+    width, height = (int(value) for value in combination["resolution"].split("x"))
+    command: List[str] = [args.editor]
+    if args.map:
+        command.append(args.map)
+    command += [
+        os.path.abspath(args.project),
+        '-ExecCmds="py kickoff.py"',
+        f"-Sequence={args.sequence}",
+        f"-StartFrame={args.start_frame}",
+        f"-EndFrame={args.end_frame}",
+        f"-Width={width}",
+        f"-Height={height}",
+        f"-SpatialSampleCount={combination['spatial_sample_count']}",
+        f"-TemporalSampleCount={combination['temporal_sample_count']}",
+        f"-DeferredPass={combination['deferred_pass']}",
+        "-Telemetry",
+        f"-TelemetryDirectory={telemetry_directory}",
+    ]
+    if combination["console_variables"]:
+        command.append(f"-ConsoleVariables={combination['console_variables']}")
+
+    # mmacieje: See `launch` in `shard.py` as to why this is not a list on
+    # Windows.
+    started_at = time.time()
+    completed = subprocess.run(" ".join(command) if sys.platform == "win32" else command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall_time = time.time() - started_at
+
+    result: Dict[str, Any] = dict(combination)
+    result.update({"exit_code": completed.returncode, "wall_time": wall_time})
+
+    summary_paths = glob.glob(os.path.join(telemetry_directory, "*.summary.json"))
+    if not summary_paths:
+        result["error"] = "no telemetry summary was written"
+        return result
+
+    with open(summary_paths[0]) as summary_file:
+        summary = json.load(summary_file)
+    result.update({
+        "frames": summary["frames"],
+        "frames_per_second": summary["frames_per_second"],
+        "warm_up_time": summary["warm_up_time"],
+        "producing_frames_time": summary["producing_frames_time"],
+        "frame_latency_p50": summary["frame_latency_p50"],
+        "frame_latency_p95": summary["frame_latency_p95"],
+        "peak_rss": summary["peak_rss"],
+    })
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render one Sequence across a matrix of settings and report throughput and peak memory.")
+    parser.add_argument("--editor", required=True)
+    parser.add_argument("--project", required=True)
+    parser.add_argument("--map", default="")
+    parser.add_argument("--sequence", required=True)
+    parser.add_argument("--start-frame", type=int, default=0)
+    parser.add_argument("--end-frame", type=int, default=30)
+    parser.add_argument("--resolutions", nargs="+", default=["1920x1080"])
+    parser.add_argument("--spatial", type=int, nargs="+", default=[1])
+    parser.add_argument("--temporal", type=int, nargs="+", default=[1])
+    parser.add_argument("--passes", nargs="+", default=["Base"])
+    parser.add_argument("--cvars", nargs="+", default=[""], help="`-ConsoleVariables` values; an empty string stands for the defaults")
+    parser.add_argument("--output", default="", help="append results here as JSON lines rather than to standard output")
+    args = parser.parse_args(argv)
+
+    output_file = open(args.output, "a") if args.output else sys.stdout
+    failed_count: int = 0
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        for combination_idx, (resolution, spatial_sample_count, temporal_sample_count, deferred_pass, console_variables) in enumerate(itertools.product(args.resolutions, args.spatial, args.temporal, args.passes, args.cvars)):
+            combination = {
+                "resolution": resolution,
+                "spatial_sample_count": spatial_sample_count,
+                "temporal_sample_count": temporal_sample_count,
+                "deferred_pass": deferred_pass,
+                "console_variables": console_variables,
+            }
+            result = run_combination(args, combination, os.path.join(temporary_dir, str(combination_idx)))
+            failed_count += 1 if "error" in result else 0
+            output_file.write(json.dumps(result) + "\n")
+            output_file.flush()
+
+    if args.output:
+        output_file.close()
+    return 1 if failed_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
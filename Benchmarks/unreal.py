@@ -0,0 +1,354 @@
+from typing import Any, Dict, List, Tuple
+import os
+import shlex
+import tempfile
+
+# NOTE(mmacieje): A stand-in for the `unreal` module, just faithful enough for
+# `host_executor.py` to be imported and driven outside of the editor, so that
+# `bench_executor.py` measures the executor's own overhead and nothing else.
+# Every engine call is a no-op that returns something of the right shape;
+# nothing here renders, loads or validates anything. Unknown class names are
+# made up on the fly as generic settings, which is what most of them are.
+
+command_line: str = ""
+saved_dir: str = os.path.join(tempfile.gettempdir(), "ExecutorBenchmarks", "Saved")
+loaded_maps: List[str] = []
+
+
+def log(message: str) -> None:
+    pass
+
+
+def log_warning(message: str) -> None:
+    pass
+
+
+def log_error(message: str) -> None:
+    pass
+
+
+def uclass(*args: Any, **kwargs: Any) -> Any:
+    return lambda cls: cls
+
+
+def ufunction(*args: Any, **kwargs: Any) -> Any:
+    return lambda function: function
+
+
+def uproperty(*args: Any, **kwargs: Any) -> Any:
+    return None
+
+
+def Array(element_type: Any) -> Any:
+    return list
+
+
+class _Enum:
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, value: str) -> str:
+        return f"{self._name}.{value}"
+
+
+AntiAliasingMethod = _Enum("AntiAliasingMethod")
+EXRCompressionFormat = _Enum("EXRCompressionFormat")
+MoviePipelineTextureStreamingMethod = _Enum("MoviePipelineTextureStreamingMethod")
+MovieRenderPipelineState = _Enum("MovieRenderPipelineState")
+MovieRenderShotState = _Enum("MovieRenderShotState")
+
+
+class _Value:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.args = args
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+
+class IntPoint(_Value):
+    pass
+
+
+class FrameRate(_Value):
+    def __init__(self, numerator: int = 30, denominator: int = 1) -> None:
+        self.numerator = numerator
+        self.denominator = denominator
+
+
+class DirectoryPath(_Value):
+    path: str = ""
+
+
+class SoftObjectPath:
+    def __init__(self, path: str = "") -> None:
+        self.path = path
+
+    def export_text(self) -> str:
+        return self.path
+
+
+class Object:
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def get_path_name(self) -> str:
+        return "/Game/Maps/Benchmark"
+
+    def get_name(self) -> str:
+        return type(self).__name__
+
+    def get_outer(self) -> "Object":
+        return Object()
+
+
+class _Setting(Object):
+    def __init__(self) -> None:
+        self.additional_post_process_materials: List[Any] = []
+        self.console_variables: Dict[str, float] = {}
+        self.use_custom_playback_range = False
+        self.custom_start_frame = -1
+        self.custom_end_frame = -1
+        self.use_custom_frame_rate = False
+        self.output_frame_rate = FrameRate()
+        self.output_directory = DirectoryPath(path="{project_dir}/Saved/MovieRenders")
+
+    def __getattr__(self, name: str) -> Any:
+        # mmacieje: Properties nobody has set keep their (unknown) defaults.
+        return None
+
+    def add_or_update_console_variable(self, name: str, value: float) -> None:
+        self.console_variables[name] = value
+
+
+class MoviePipelinePrimaryConfig(Object):
+    def __init__(self) -> None:
+        self.settings: Dict[Any, _Setting] = {}
+
+    def find_or_add_setting_by_class(self, setting_class: Any) -> _Setting:
+        if setting_class not in self.settings:
+            self.settings[setting_class] = setting_class()
+        return self.settings[setting_class]
+
+    def find_settings_by_class(self, setting_class: Any, include_disabled_settings: bool = False, exact_match: bool = False) -> List[_Setting]:
+        return [setting for settings_class, setting in self.settings.items() if settings_class is setting_class]
+
+    def initialize_transient_settings(self) -> None:
+        pass
+
+    def copy(self) -> "MoviePipelinePrimaryConfig":
+        configuration = MoviePipelinePrimaryConfig()
+        for setting_class, setting in self.settings.items():
+            duplicate = setting_class()
+            duplicate.__dict__.update({name: list(value) if isinstance(value, list) else dict(value) if isinstance(value, dict) else value for name, value in setting.__dict__.items()})
+            configuration.settings[setting_class] = duplicate
+        return configuration
+
+
+class MoviePipelineExecutorJob(Object):
+    def __init__(self) -> None:
+        self.comment = ""
+        self.job_name = ""
+        self.map = SoftObjectPath()
+        self.sequence = SoftObjectPath()
+        self.configuration = MoviePipelinePrimaryConfig()
+
+    def get_configuration(self) -> MoviePipelinePrimaryConfig:
+        return self.configuration
+
+    def set_configuration(self, configuration: MoviePipelinePrimaryConfig) -> None:
+        self.configuration = configuration.copy()
+
+
+class MoviePipelineQueue(Object):
+    def __init__(self) -> None:
+        self.jobs: List[MoviePipelineExecutorJob] = []
+
+    def allocate_new_job(self) -> MoviePipelineExecutorJob:
+        self.jobs.append(MoviePipelineExecutorJob())
+        return self.jobs[-1]
+
+    def duplicate_job(self, job: MoviePipelineExecutorJob) -> MoviePipelineExecutorJob:
+        duplicate = self.allocate_new_job()
+        duplicate.comment, duplicate.job_name, duplicate.map, duplicate.sequence = job.comment, job.job_name, job.map, job.sequence
+        duplicate.configuration = job.configuration.copy()
+        return duplicate
+
+    def get_jobs(self) -> List[MoviePipelineExecutorJob]:
+        return list(self.jobs)
+
+
+class _Delegate:
+    def add_function_unique(self, target: Any, function_name: str) -> None:
+        pass
+
+    def add_callable_unique(self, function: Any) -> None:
+        pass
+
+
+class MoviePipelineExecutorBase(Object):
+    def __init__(self) -> None:
+        self.user_data = ""
+        self.target_pipeline_class = None
+        self.on_executor_errored_delegate = _Delegate()
+        self.on_executor_finished_delegate = _Delegate()
+        self.on_individual_job_started_delegate = _Delegate()
+        self.on_individual_job_work_finished_delegate = _Delegate()
+        self.on_individual_shot_work_finished_delegate = _Delegate()
+        self.socket_message_recieved_delegate = _Delegate()
+        self.http_response_recieved_delegate = _Delegate()
+        post_init = getattr(self, "_post_init", None)
+        if post_init:
+            post_init()
+
+    def on_begin_frame(self) -> None:
+        pass
+
+    def connect_socket(self, host: str, port: int) -> bool:
+        return True
+
+    def disconnect_socket(self) -> None:
+        pass
+
+    def send_socket_message(self, message: str) -> bool:
+        return True
+
+    def on_executor_finished_impl(self) -> None:
+        pass
+
+    def on_executor_errored_impl(self, *args: Any) -> None:
+        pass
+
+
+class MoviePipelinePythonHostExecutor(MoviePipelineExecutorBase):
+    pass
+
+
+class MoviePipelinePIEExecutor(MoviePipelineExecutorBase):
+    def set_is_rendering_offscreen(self, offscreen: bool) -> None:
+        pass
+
+    def execute(self, queue: MoviePipelineQueue) -> None:
+        pass
+
+
+class MoviePipeline(Object):
+    pass
+
+
+class MoviePipelineFilenameResolveParams(_Value):
+    job = None
+
+
+def ObjectIterator(object_class: Any) -> List[Any]:
+    return []
+
+
+class SystemLibrary:
+    @staticmethod
+    def get_command_line() -> str:
+        return command_line
+
+    @staticmethod
+    def parse_command_line(in_command_line: str) -> Tuple[List[str], List[str], Dict[str, str]]:
+        tokens: List[str] = []
+        switches: List[str] = []
+        params: Dict[str, str] = {}
+        for token in shlex.split(in_command_line):
+            if not token.startswith("-"):
+                tokens.append(token)
+            elif "=" in token:
+                name, value = token[1:].split("=", 1)
+                params[name] = value
+            else:
+                switches.append(token[1:])
+        return tokens, switches, params
+
+    @staticmethod
+    def get_engine_version() -> str:
+        return "5.4.0-0+++UE5+Release-5.4"
+
+    @staticmethod
+    def quit_editor() -> None:
+        pass
+
+
+class Paths:
+    @staticmethod
+    def project_saved_dir() -> str:
+        return saved_dir
+
+    @staticmethod
+    def project_dir() -> str:
+        return os.path.dirname(saved_dir)
+
+    @staticmethod
+    def convert_relative_path_to_full(path: str) -> str:
+        return os.path.abspath(path)
+
+
+class EditorLevelLibrary:
+    @staticmethod
+    def get_editor_world() -> Object:
+        return Object()
+
+
+class EditorLoadingAndSavingUtils:
+    @staticmethod
+    def load_map(map_ref: str) -> None:
+        loaded_maps.append(map_ref)
+
+
+class EditorAssetLibrary:
+    @staticmethod
+    def load_asset(asset_ref: str) -> Object:
+        return Object()
+
+
+def load_asset(asset_ref: str) -> Object:
+    return Object()
+
+
+# mmacieje: Every asset exists, and is whatever the benchmark's made-up paths
+# make it look like.
+asset_class_names: Dict[str, str] = {
+    "/Game/Maps/": "World",
+    "/Game/Shots/": "LevelSequence",
+    "/Executor/": "Material",
+}
+
+
+class AssetData(_Value):
+    pass
+
+
+class AssetRegistry:
+    def get_assets_by_package_name(self, package_name: str, include_only_on_disk_assets: bool = False) -> List[AssetData]:
+        class_name = next((class_name for path, class_name in asset_class_names.items() if package_name.startswith(path)), "Object")
+        return [AssetData(package_name=package_name, asset_name=package_name.rsplit("/", 1)[-1], asset_class_path=_Value(asset_name=class_name))]
+
+
+class AssetRegistryHelpers:
+    @staticmethod
+    def get_asset_registry() -> AssetRegistry:
+        return AssetRegistry()
+
+
+class MoviePipelineLibrary:
+    @staticmethod
+    def get_map_package_name(job: MoviePipelineExecutorJob) -> str:
+        return job.map.path.split(".", 1)[0]
+
+    @staticmethod
+    def resolve_filename_format_arguments(format_string: str, params: MoviePipelineFilenameResolveParams) -> Tuple[str, Any]:
+        # mmacieje: Only what tells one job's output from another's
+        if params.job:
+            format_string = format_string.replace("{sequence_name}", params.job.sequence.export_text().split(".", 1)[0].rsplit("/", 1)[-1])
+        return format_string, None
+
+
+def __getattr__(name: str) -> Any:
+    # mmacieje: `MoviePipelineOutputSetting`, `MoviePipelineDeferredPassBase`
+    # and friends.
+    setting_class = type(name, (_Setting,), {})
+    globals()[name] = setting_class
+    return setting_class
@@ -0,0 +1,102 @@
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import json
+import socket
+import struct
+import sys
+
+# NOTE(mmacieje): Just like `shard.py`, this module is run _outside_ of the
+# editor. It is the other end of the socket `HostExecutor` connects to when
+# the editor is started with `-Daemon` (and, optionally, `-DaemonPort=`): it
+# waits for the editor to connect, hands it jobs and prints every status
+# message it gets back as a line of JSON. Movie Pipeline frames each socket
+# message with its UTF-8 length as a 32-bit little-endian integer, hence the
+# `struct` dance below.
+#
+# Jobs are JSON objects with the same fields `execute_delayed` reads from the
+# command line, one per line, e.g.:
+#
+#     {"id": "shot_010", "Sequence": "/Game/Shots/Shot_010.Shot_010", "Width": 2560, "Height": 1440, "Multilayer": true}
+#
+
+DAEMON_PORT: int = 8723
+
+TERMINAL_STATUSES = ("finished", "errored", "rejected")
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]) -> None:
+    payload = json.dumps(message).encode("utf-8")
+    connection.sendall(struct.pack("<i", len(payload)) + payload)
+
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("The editor has closed the connection")
+        data += chunk
+    return data
+
+
+def receive_message(connection: socket.socket) -> Dict[str, Any]:
+    (size,) = struct.unpack("<i", receive_exactly(connection, 4))
+    return json.loads(receive_exactly(connection, size).decode("utf-8"))
+
+
+def read_jobs(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    jobs: List[Dict[str, Any]] = []
+    for line_idx, line in enumerate(lines):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        job = json.loads(line)
+        jobs.append({"id": str(job.pop("id", line_idx)), "job": job})
+    return jobs
+
+
+def dispatch(connection: socket.socket, jobs: List[Dict[str, Any]], quit_when_done: bool) -> int:
+    # mmacieje: The executor keeps a backlog of its own, so there is no need
+    # to wait for one job to finish before sending the next.
+    for job in jobs:
+        send_message(connection, {"command": "render", "id": job["id"], "job": job["job"]})
+
+    outstanding = {job["id"] for job in jobs}
+    failed_count: int = 0
+    while outstanding:
+        status = receive_message(connection)
+        print(json.dumps(status), flush=True)
+        if status.get("id") in outstanding and status.get("status") in TERMINAL_STATUSES:
+            outstanding.discard(status["id"])
+            if status["status"] != "finished":
+                failed_count += 1
+
+    if quit_when_done:
+        send_message(connection, {"command": "quit"})
+    return 1 if failed_count else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Feed jobs to an editor started with `-Daemon`.")
+    parser.add_argument("jobs", help="JSON-lines file with one job per line, or `-` for standard input")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT)
+    parser.add_argument("--timeout", type=float, default=600.0, help="how long to wait for the editor to connect, in seconds")
+    parser.add_argument("--keep-alive", action="store_true", help="do not ask the editor to quit once all jobs are done")
+    args = parser.parse_args(argv)
+
+    if args.jobs == "-":
+        jobs = read_jobs(sys.stdin)
+    else:
+        with open(args.jobs) as jobs_file:
+            jobs = read_jobs(jobs_file)
+
+    with socket.create_server(("127.0.0.1", args.port)) as server:
+        server.settimeout(args.timeout)
+        connection, _address = server.accept()
+        connection.settimeout(None)
+        with connection:
+            return dispatch(connection, jobs, not args.keep_alive)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+from typing import Any, Dict, Iterable, List, Set
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+# NOTE(mmacieje): A content-addressed cache of rendered frames, so that frames
+# whose inputs have not changed since an earlier run are linked or copied
+# rather than rendered again. A frame is addressed by the fingerprint of the
+# job it belongs to, i.e. the hashes of every package the job's Sequence, map
+# and materials consist of, the job's parameters (which make up the whole
+# configuration `populate_sequence_job` builds, console variables included)
+# and the engine version, plus its frame number:
+#
+#     <cache>/<fingerprint>/passes.json
+#     <cache>/<fingerprint>/<render_pass>/<frame_number>.<ext>
+#
+# `passes.json` lists the render passes a job produces; a frame is only a hit
+# if every one of them holds it. Like `frames.py`, this module does not import
+# `unreal`; `HostExecutor` resolves packages to files and feeds them here.
+#
+# Bear in mind that hard links share their contents with the cache, so a link
+# overwritten in place corrupts the cache entry it came from. `HostExecutor`
+# removes the frames it is about to render before rendering them, but anything
+# else rendering into the same directories had better not use `link`.
+
+COPY: str = "copy"
+LINK: str = "link"
+
+PACKAGE_EXTENSIONS = (".uasset", ".umap", ".uexp", ".ubulk", ".uptnl")
+
+# mmacieje: World Partition and One File Per Actor keep a map's actors in
+# packages of their own, outside of the map's.
+EXTERNAL_PACKAGE_DIRS = ("__ExternalActors__", "__ExternalObjects__")
+
+
+def package_files(package_name: str, content_roots: Dict[str, str]) -> List[str]:
+    # mmacieje: `/Game/Maps/Street` -> `<project>/Content/Maps/Street.umap`
+    # and friends; packages of unknown mount points (`/Script/...`,
+    # `/Engine/...`) resolve to nothing and are covered by the engine version.
+    for mount_point, content_dir in content_roots.items():
+        if not package_name.startswith(mount_point):
+            continue
+        relative_path = package_name[len(mount_point):]
+        paths: List[str] = [os.path.join(content_dir, relative_path + extension) for extension in PACKAGE_EXTENSIONS]
+        paths = [path for path in paths if os.path.isfile(path)]
+        for external_dir in EXTERNAL_PACKAGE_DIRS:
+            for dir_path, _dir_names, file_names in os.walk(os.path.join(content_dir, external_dir, relative_path)):
+                paths += [os.path.join(dir_path, file_name) for file_name in file_names]
+        return sorted(paths)
+    return []
+
+
+def hash_files(paths: Iterable[str], memo: Dict[str, Any]) -> str:
+    # mmacieje: Contents are hashed only when size or modification time say
+    # a file has changed since the last run; `memo` is kept on disk for that.
+    digest = hashlib.sha1()
+    for path in sorted(set(paths)):
+        stat = os.stat(path)
+        known = memo.get(path)
+        if not known or known[0] != stat.st_size or known[1] != stat.st_mtime_ns:
+            file_digest = hashlib.sha1()
+            with open(path, "rb") as package_file:
+                for chunk in iter(lambda: package_file.read(1 << 20), b""):
+                    file_digest.update(chunk)
+            known = memo[path] = [stat.st_size, stat.st_mtime_ns, file_digest.hexdigest()]
+        digest.update(f"{path}\0{known[2]}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def write_json(path: str, value: Any) -> None:
+    # mmacieje: Write-then-rename through a temporary file of our own, as
+    # `shard.py` workers share the memo and, their frame ranges aside, the
+    # fingerprint too.
+    fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    with os.fdopen(fd, "w") as json_file:
+        json.dump(value, json_file)
+    os.replace(temporary_path, path)
+
+
+def load_memo(cache_directory: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(cache_directory, "package_hashes.json")) as memo_file:
+            return json.load(memo_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_memo(cache_directory: str, memo: Dict[str, Any]) -> None:
+    os.makedirs(cache_directory, exist_ok=True)
+    write_json(os.path.join(cache_directory, "package_hashes.json"), memo)
+
+
+def fingerprint(package_hash: str, parameters: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps({"packages": package_hash, "parameters": parameters}, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def frame_files(render_pass_dir: str) -> Dict[int, List[str]]:
+    # mmacieje: A frame and whatever sits next to it, e.g. `0042.exr` and
+    # `0042.exr.sha256`.
+    files_per_frame: Dict[int, List[str]] = {}
+    if not os.path.isdir(render_pass_dir):
+        return files_per_frame
+    for file_name in os.listdir(render_pass_dir):
+        stem = file_name.split(".", 1)[0]
+        if stem.isdigit() and os.path.isfile(os.path.join(render_pass_dir, file_name)):
+            files_per_frame.setdefault(int(stem), []).append(file_name)
+    return files_per_frame
+
+
+def place(source: str, destination: str, mode: str) -> None:
+    # mmacieje: Never leave half a file behind, nor write through an existing
+    # link into whatever it points at.
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    # mmacieje: Renaming a link over another link to the same file is a no-op
+    # that leaves the temporary one behind.
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        return
+    if os.path.lexists(destination + ".tmp"):
+        os.remove(destination + ".tmp")
+    if mode == LINK:
+        try:
+            os.link(source, destination + ".tmp")
+        except OSError:
+            shutil.copyfile(source, destination + ".tmp")
+    else:
+        shutil.copyfile(source, destination + ".tmp")
+    os.replace(destination + ".tmp", destination)
+
+
+def restore(cache_directory: str, job_fingerprint: str, output_directory: str, wanted_frames: Iterable[int], mode: str) -> Set[int]:
+    # mmacieje: Places every cached frame of `wanted_frames` in the output
+    # directory and returns which those were.
+    entry_dir = os.path.join(cache_directory, job_fingerprint)
+    try:
+        with open(os.path.join(entry_dir, "passes.json")) as passes_file:
+            render_passes: List[str] = json.load(passes_file)
+    except (OSError, ValueError):
+        return set()
+    if not render_passes:
+        return set()
+
+    files_per_pass = {render_pass: frame_files(os.path.join(entry_dir, render_pass)) for render_pass in render_passes}
+    hits: Set[int] = set(wanted_frames).intersection(*(set(files_per_frame) for files_per_frame in files_per_pass.values()))
+    for render_pass, files_per_frame in files_per_pass.items():
+        for frame in hits:
+            for file_name in files_per_frame[frame]:
+                place(os.path.join(entry_dir, render_pass, file_name), os.path.join(output_directory, render_pass, file_name), mode)
+    return hits
+
+
+def remove_frames(output_directory: str, doomed_frames: Set[int]) -> None:
+    # mmacieje: Frames about to be rendered again; see the note above.
+    if not os.path.isdir(output_directory):
+        return
+    for render_pass in os.listdir(output_directory):
+        render_pass_dir = os.path.join(output_directory, render_pass)
+        for frame, file_names in frame_files(render_pass_dir).items():
+            if frame in doomed_frames:
+                for file_name in file_names:
+                    os.remove(os.path.join(render_pass_dir, file_name))
+
+
+def store(cache_directory: str, job_fingerprint: str, output_directory: str, newer_than: float, mode: str) -> Set[int]:
+    # mmacieje: Adds every frame the job has just written to each of its
+    # render passes; returns which those were.
+    if not os.path.isdir(output_directory):
+        return set()
+    files_per_pass: Dict[str, Dict[int, List[str]]] = {}
+    for render_pass in sorted(os.listdir(output_directory)):
+        files_per_frame = frame_files(os.path.join(output_directory, render_pass))
+        fresh = {frame: file_names for frame, file_names in files_per_frame.items() if all(os.path.getmtime(os.path.join(output_directory, render_pass, file_name)) >= newer_than for file_name in file_names)}
+        if fresh:
+            files_per_pass[render_pass] = fresh
+    if not files_per_pass:
+        return set()
+
+    # mmacieje: The list of passes goes first, so that an entry cut short
+    # never passes for a complete one.
+    entry_dir = os.path.join(cache_directory, job_fingerprint)
+    os.makedirs(entry_dir, exist_ok=True)
+    write_json(os.path.join(entry_dir, "passes.json"), sorted(files_per_pass))
+
+    stored: Set[int] = set.intersection(*(set(files_per_frame) for files_per_frame in files_per_pass.values()))
+    for render_pass, files_per_frame in files_per_pass.items():
+        for frame in stored:
+            for file_name in files_per_frame[frame]:
+                place(os.path.join(output_directory, render_pass, file_name), os.path.join(entry_dir, render_pass, file_name), mode)
+    return stored
@@ -0,0 +1,102 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import os
+
+from postprocess import FRAME_EXTENSIONS
+
+# NOTE(mmacieje): Helpers for looking at what a job has already written to
+# its output directory, shared by `shard.py` (outside of the editor) and by
+# `HostExecutor` (inside of it), hence no `unreal` here. Frames are expected to
+# be named after their frame number, as `output_setting.file_name_format`
+# (`{render_pass}/{frame_number}`) has them, and spans are half-open, just
+# like `custom_start_frame`/`custom_end_frame`.
+
+Span = Tuple[int, int]
+
+
+def frame_number(file_name: str) -> Optional[int]:
+    # mmacieje: `0042.exr` is frame 42; `0042.exr.sha256`, which the
+    # `checksum` step writes next to it, is not a frame at all.
+    stem, extension = os.path.splitext(file_name)
+    if not stem.isdigit() or extension.lower() not in FRAME_EXTENSIONS:
+        return None
+    return int(stem)
+
+
+def render_pass_dirs(output_directory: str) -> Iterator[Tuple[str, str, List[str]]]:
+    # mmacieje: Frames live right below their `{render_pass}` directory (or
+    # right in the output directory, for a flat `file_name_format`); anything
+    # deeper, e.g. `{render_pass}/proxy`, was written by a post-processing
+    # step, just like `postprocess.landed_frames` has it.
+    for render_pass in ["."] + sorted(os.listdir(output_directory)):
+        dir_path = os.path.normpath(os.path.join(output_directory, render_pass))
+        if os.path.isdir(dir_path):
+            yield render_pass, dir_path, [file_name for file_name in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, file_name))]
+
+
+def frame_paths(output_directory: str, wanted_frames: Set[int]) -> List[str]:
+    if not os.path.isdir(output_directory):
+        return []
+    return [os.path.join(dir_path, file_name) for _render_pass, dir_path, file_names in render_pass_dirs(output_directory) for file_name in file_names if frame_number(file_name) in wanted_frames]
+
+
+def collect_frames(output_directory: str, newer_than: float = 0.0) -> Dict[str, Dict[int, int]]:
+    # mmacieje: Map each `{render_pass}` directory to a frame number -> file
+    # count mapping. Anything but a frame is ignored.
+    frames_per_pass: Dict[str, Dict[int, int]] = {}
+    if not os.path.isdir(output_directory):
+        return frames_per_pass
+
+    for render_pass, dir_path, file_names in render_pass_dirs(output_directory):
+        for file_name in file_names:
+            frame = frame_number(file_name)
+            if frame is None:
+                continue
+            if newer_than and os.path.getmtime(os.path.join(dir_path, file_name)) < newer_than:
+                continue
+            frames = frames_per_pass.setdefault(render_pass, {})
+            frames[frame] = frames.get(frame, 0) + 1
+    return frames_per_pass
+
+
+def newest_frames(output_directory: str) -> Set[int]:
+    # mmacieje: The most recently written frame of each render pass, i.e. the
+    # one most likely to be truncated if the editor died while writing it.
+    newest: Dict[str, Tuple[float, int]] = {}
+    if not os.path.isdir(output_directory):
+        return set()
+
+    for _render_pass, dir_path, file_names in render_pass_dirs(output_directory):
+        for file_name in file_names:
+            frame = frame_number(file_name)
+            if frame is None:
+                continue
+            modified_at = os.path.getmtime(os.path.join(dir_path, file_name))
+            if modified_at >= newest.get(dir_path, (0.0, 0))[0]:
+                newest[dir_path] = (modified_at, frame)
+    return {frame for _modified_at, frame in newest.values()}
+
+
+def complete_frames(output_directory: str, newer_than: float = 0.0) -> Set[int]:
+    # mmacieje: A frame is complete once every render pass has written it.
+    frames_per_pass = collect_frames(output_directory, newer_than)
+    if not frames_per_pass:
+        return set()
+    return set.intersection(*(set(frames) for frames in frames_per_pass.values())) - newest_frames(output_directory)
+
+
+def frame_spans(frames: Iterable[int]) -> List[Span]:
+    spans: List[Span] = []
+    for frame in sorted(set(frames)):
+        if spans and spans[-1][1] == frame:
+            spans[-1] = (spans[-1][0], frame + 1)
+        else:
+            spans.append((frame, frame + 1))
+    return spans
+
+
+def missing_spans(start_frame: int, end_frame: int, done_frames: Set[int]) -> List[Span]:
+    return frame_spans(frame for frame in range(start_frame, end_frame) if frame not in done_frames)
+
+
+def format_frames(frames: Iterable[int]) -> str:
+    return ", ".join(str(start) if end - start == 1 else f"{start}-{end - 1}" for start, end in frame_spans(frames))
@@ -1,6 +1,20 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import time
 import unreal
 
+import framecache
+import frames
+import postprocess
+import preflight
+import resume
+import telemetry
+import tiling
+import timeline
+import warmup
+
 deferred_passes_name_type_dict: Dict[str, Any] = {
     "base": unreal.MoviePipelineDeferredPassBase,
     "unlit": unreal.MoviePipelineDeferredPass_Unlit,
@@ -15,27 +29,442 @@ materials_name_ref_dict: Dict[str, str] = {
     "postprocessinput2": "/Executor/PostProcessInput2.PostProcessInput2",
 }
 
-console_vars_name_value_dict: Dict[str, int] = {
-    # mmacieje: "your.Console.Variable": <its_value>,
-    "r.Nanite": 0,
-}
+# mmacieje: Named sets of console variables, e.g. `final` and `preview`;
+# `-CVarProfiles` points at another file of the same shape.
+CVAR_PROFILES_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cvar_profiles.json")
+
+# mmacieje: Parameters that apply to every job of a manifest unless the
+# entry says otherwise.
+WORKLOAD_WIDE_PARAMETER_NAMES = ("Preview", "PreviewStride", "PreviewScale", "CVarProfile", "CVarProfiles", "MemoryBudget")
 
 SEQUENCE: int = 0
 CONFIGURATION: int = 1
 QUEUE: int = 2
+MANIFEST: int = 3
+
+DAEMON_PORT: int = 8723
+
+
+def find_needle(haysack: List[Any], needle: Any) -> bool:
+    result = False
+    for item in haysack:
+        if item == needle:
+            result = True
+            break
+    return result
+
+
+def current_map_package_name() -> str:
+    world_ref = unreal.EditorLevelLibrary.get_editor_world()
+    package_ref = world_ref.get_outer()
+    return package_ref.get_path_name()
+
+
+def has_workload(cmdln_args: Dict[str, Any]) -> bool:
+    return any(cmdln_args.get(name) for name in ("Sequence", "Configuration", "Queue", "Manifest"))
+
+
+def load_manifest(manifest_ref: str) -> List[Dict[str, Any]]:
+    # mmacieje: Either `{"jobs": [...]}` or a bare list of jobs, each using the
+    # very names of the command line, plus `Map` and `ConsoleVariables`.
+    with open(manifest_ref) as manifest_file:
+        manifest = json.load(manifest_file)
+    entries = manifest.get("jobs", []) if isinstance(manifest, dict) else manifest
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError("a manifest holds a list of jobs, each a JSON object")
+    if not entries:
+        raise ValueError("a manifest holds at least one job")
+    return entries
+
+
+cvar_profiles_path_dict: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+
+def load_cvar_profiles(path: str) -> Dict[str, Dict[str, float]]:
+    # mmacieje: Read once per path; a manifest asks for it once per entry.
+    if path not in cvar_profiles_path_dict:
+        try:
+            with open(path) as profiles_file:
+                cvar_profiles_path_dict[path] = {name: parse_console_variables(profile) for name, profile in json.load(profiles_file).items()}
+        except (OSError, ValueError, AttributeError) as exception:
+            unreal.log_error(f"Console variable profiles '{path}' are unreadable: {exception}")
+            cvar_profiles_path_dict[path] = {}
+    return cvar_profiles_path_dict[path]
+
+
+def inherit_parameters(entry_switches: List[str], entry_args: Dict[str, Any], cmdln_switches: List[str], cmdln_args: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+    entry_switches = entry_switches + [name for name in WORKLOAD_WIDE_PARAMETER_NAMES if name in cmdln_switches and name not in entry_switches]
+    entry_args = dict(entry_args, **{name: cmdln_args[name] for name in WORKLOAD_WIDE_PARAMETER_NAMES if name in cmdln_args and name not in entry_args})
+    return entry_switches, entry_args
+
+
+def parse_deferred_passes(deferred_pass: str, materials: str) -> List[List[Any]]:
+    # mmacieje: `Base:PostProcessInput2+Other,LightingOnly` -> `[["base",
+    # ["PostProcessInput2", "Other"]], ["lightingonly", [...]]]`; a pass with
+    # no materials of its own gets those of `-Materials`, and `Base:` none.
+    default_material_names: List[str] = [item.strip() for item in materials.split(",") if item.strip()]
+    deferred_passes: List[List[Any]] = []
+    for item in deferred_pass.split(","):
+        if not item.strip():
+            continue
+        pass_name, separator, material_names = item.partition(":")
+        deferred_passes.append([pass_name.strip().lower(), [name.strip() for name in material_names.split("+") if name.strip()] if separator else list(default_material_names)])
+    return deferred_passes
+
+
+def material_refs_of(material_names: List[str]) -> List[str]:
+    return [materials_name_ref_dict[name.lower()] for name in material_names if name.lower() in materials_name_ref_dict]
+
+
+def job_material_refs(parameters: Dict[str, Any]) -> List[str]:
+    return [material_ref for _pass_name, material_names in parameters["deferred_passes"] for material_ref in material_refs_of(material_names)]
+
+
+def parse_console_variables(console_variables: Any) -> Dict[str, float]:
+    # mmacieje: Either a `{"r.Nanite": 0}` mapping (manifest entries, daemon
+    # jobs) or a `r.Nanite=0,r.Other=1` string (command line).
+    if isinstance(console_variables, str):
+        pairs = [item.split("=", 1) for item in console_variables.split(",") if item.strip()]
+        console_variables = {name.strip(): value for name, value in pairs}
+    return {str(name): float(value) for name, value in console_variables.items()}
+
+
+def warm_up_cache_path() -> str:
+    return os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "WarmUpCache.json")
+
+
+def parse_job_parameters(cmdln_switches: List[str], cmdln_args: Dict[str, Any], warm_up_cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # mmacieje: Everything a SEQUENCE job is made of, converted to proper
+    # types and with defaults provided.
+    # mmacieje: A preview renders every `PreviewStride`th frame at
+    # `PreviewScale` times the resolution and sample counts, with the cheap
+    # `preview` console variable profile rather than the `final` one.
+    preview: bool = find_needle(cmdln_switches, "Preview")
+    preview_scale: float = float(cmdln_args.get("PreviewScale", 0.5)) if preview else 1.0
+
+    cvar_profiles_path: str = str(cmdln_args.get("CVarProfiles", CVAR_PROFILES_PATH))
+    cvar_profile: str = str(cmdln_args.get("CVarProfile", "preview" if preview else "final")).lower()
+    console_variables: Dict[str, float] = dict(load_cvar_profiles(cvar_profiles_path).get(cvar_profile, {}))
+    console_variables.update(parse_console_variables(cmdln_args.get("ConsoleVariables", {})))
+
+    map_ref: str = str(cmdln_args.get("Map", "")) or current_map_package_name()
+    sequence_ref: str = str(cmdln_args.get("Sequence", ""))
+
+    # mmacieje: Calibrated warm-up counts (see `warmup.py`) take the place of
+    # the defaults, never of counts given explicitly.
+    warm_up_counts: Dict[str, int] = {"engine_warm_up_count": 101, "render_warm_up_count": 97}
+    if warm_up_cache:
+        calibrated = warm_up_cache.get(warmup.cache_key(map_ref, sequence_ref, unreal.SystemLibrary.get_engine_version()))
+        if calibrated:
+            warm_up_counts = {name: int(calibrated[name]) for name in warm_up_counts}
+
+    return {
+        "map_ref": map_ref,
+        "sequence_ref": sequence_ref,
+        "width": max(1, round(int(cmdln_args.get("Width", 1920)) * preview_scale)),
+        "height": max(1, round(int(cmdln_args.get("Height", 1080)) * preview_scale)),
+        "start_frame": int(cmdln_args.get("StartFrame", -1)),
+        "end_frame": int(cmdln_args.get("EndFrame", -1)),
+        "frame_rate": int(cmdln_args.get("FrameRate", 30)),
+        "temporal_sample_count": max(1, round(int(cmdln_args.get("TemporalSampleCount", 1)) * preview_scale)),
+        "spatial_sample_count": max(1, round(int(cmdln_args.get("SpatialSampleCount", 1)) * preview_scale)),
+        "deferred_passes": parse_deferred_passes(str(cmdln_args.get("DeferredPass", "Base")), str(cmdln_args.get("Materials", ""))),
+        "multilayer": find_needle(cmdln_switches, "Multilayer"),
+        "engine_warm_up_count": int(cmdln_args.get("EngineWarmUpCount", warm_up_counts["engine_warm_up_count"])),
+        "render_warm_up_count": int(cmdln_args.get("RenderWarmUpCount", warm_up_counts["render_warm_up_count"])),
+        "console_variables": console_variables,
+        "cvar_profile": cvar_profile,
+        "cvar_profiles_path": cvar_profiles_path,
+        "preview": preview,
+        "preview_stride": int(cmdln_args.get("PreviewStride", 4)) if preview else 1,
+        "preview_scale": preview_scale,
+        "memory_budget": int(cmdln_args.get("MemoryBudget", 0)),
+    }
+
+
+def validate_job_parameters(parameters: Dict[str, Any]) -> List[str]:
+    problems: List[str] = []
+    if not parameters["sequence_ref"]:
+        problems.append("no `Sequence` given")
+    pass_names: List[str] = [pass_name for pass_name, _material_names in parameters["deferred_passes"]]
+    if not pass_names:
+        problems.append("no `DeferredPass` given")
+    for pass_name in sorted(set(pass_names)):
+        if pass_name not in deferred_passes_name_type_dict:
+            problems.append(f"unknown `DeferredPass` '{pass_name}'")
+        if pass_names.count(pass_name) > 1:
+            problems.append(f"`DeferredPass` '{pass_name}' is listed {pass_names.count(pass_name)} times")
+    for material_name in sorted(set(name for _pass_name, material_names in parameters["deferred_passes"] for name in material_names)):
+        if material_name.lower() not in materials_name_ref_dict:
+            problems.append(f"unknown material '{material_name}'")
+    if parameters["cvar_profile"] not in load_cvar_profiles(parameters["cvar_profiles_path"]):
+        problems.append(f"unknown `CVarProfile` '{parameters['cvar_profile']}'")
+    if not 0 < parameters["preview_scale"] <= 1:
+        problems.append(f"`PreviewScale` must be within (0, 1], not {parameters['preview_scale']}")
+    if parameters["memory_budget"] < 0:
+        problems.append(f"`MemoryBudget` must not be negative, not {parameters['memory_budget']}")
+    for name in ("width", "height", "frame_rate", "temporal_sample_count", "spatial_sample_count", "preview_stride"):
+        if parameters[name] <= 0:
+            problems.append(f"`{name}` must be positive, not {parameters[name]}")
+    if parameters["start_frame"] != -1 and parameters["end_frame"] != -1 and parameters["start_frame"] >= parameters["end_frame"]:
+        problems.append(f"empty frame range [{parameters['start_frame']}, {parameters['end_frame']})")
+    return problems
+
+
+def job_to_command_line(job: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+    # mmacieje: JSON jobs (manifest entries, daemon jobs) use the very names
+    # of the command line, switches being `true`.
+    cmdln_switches: List[str] = [key for key, value in job.items() if value is True]
+    cmdln_args: Dict[str, Any] = {key: value if isinstance(value, dict) else str(value) for key, value in job.items() if not isinstance(value, bool)}
+    return cmdln_switches, cmdln_args
+
+
+def populate_sequence_job(job: unreal.MoviePipelineExecutorJob, parameters: Dict[str, Any]) -> None:
+    map_ref: str = parameters["map_ref"]
+    sequence_ref: str = parameters["sequence_ref"]
+    width: int = parameters["width"]
+    height: int = parameters["height"]
+    start_frame: int = parameters["start_frame"]
+    end_frame: int = parameters["end_frame"]
+    frame_rate: int = parameters["frame_rate"]
+    temporal_sample_count: int = parameters["temporal_sample_count"]
+    spatial_sample_count: int = parameters["spatial_sample_count"]
+    deferred_passes: List[List[Any]] = parameters["deferred_passes"]
+    multilayer: bool = parameters["multilayer"]
+    engine_warm_up_count: int = parameters["engine_warm_up_count"]
+    render_warm_up_count: int = parameters["render_warm_up_count"]
+    console_variables: Dict[str, float] = parameters["console_variables"]
+    preview: bool = parameters["preview"]
+    preview_stride: int = parameters["preview_stride"]
+    memory_budget: int = parameters["memory_budget"]
+
+    # mmacieje: Set metadata and asset references for the job
+    job.comment = "Install and repair pipes and fixtures that carry water, gas, or other fluids in homes and businesses"
+    job.job_name = "Plumber"
+    job.map = unreal.SoftObjectPath(map_ref)
+    job.sequence = unreal.SoftObjectPath(sequence_ref)
+
+    configuration = job.get_configuration()
+
+    # mmacieje: The base pass goes first: the other deferred passes are its
+    # subclasses, and it must not be mistaken for one of them when looking
+    # settings up by class.
+    pass_name_refs_list: List[Tuple[str, List[str]]] = sorted(((pass_name, material_refs_of(material_names)) for pass_name, material_names in deferred_passes), key=lambda item: item[0] != "base")
+    pass_names: str = "+".join(pass_name for pass_name, _material_names in deferred_passes)
+
+    # mmacieje: One tile unless `-MemoryBudget` (in MiB) calls for more; see
+    # `tiling.py`.
+    tile_count: int = 1
+    overlap_ratio: float = 0.0
+    if memory_budget:
+        tile_count, overlap_ratio, estimate, fits = tiling.choose_tiling(width, height, [(pass_name, len(material_refs)) for pass_name, material_refs in pass_name_refs_list], multilayer, spatial_sample_count, temporal_sample_count, memory_budget * tiling.MIB)
+        log_callable = unreal.log if fits else unreal.log_warning
+        log_callable(f"Tiling '{sequence_ref}' at {width}x{height} as {tile_count}x{tile_count} tile(s) with {overlap_ratio:.2f} overlap: an estimated {estimate / tiling.MIB:.0f} MiB per frame, {'within' if fits else 'over'} the {memory_budget} MiB budget.")
+
+    # mmacieje: High-resolution rendering settings
+    high_resolution_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineHighResSetting)
+    high_resolution_setting.allocate_history_per_tile = True
+    high_resolution_setting.burley_sample_count = 64
+    high_resolution_setting.overlap_ratio = overlap_ratio
+    high_resolution_setting.override_sub_surface_scattering = True
+    high_resolution_setting.texture_sharpness_bias = 0
+    high_resolution_setting.tile_count = tile_count
+
+    # mmacieje: Output settings
+    output_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineOutputSetting)
+    output_setting.use_custom_playback_range = start_frame != -1 and end_frame != -1
+    output_setting.custom_end_frame = end_frame
+    output_setting.custom_start_frame = start_frame
+    output_setting.output_resolution = unreal.IntPoint(width, height)
+    output_setting.use_custom_frame_rate = True
+    output_setting.output_frame_rate = unreal.FrameRate(numerator=frame_rate)
+    output_setting.output_frame_step = preview_stride
+    output_setting.zero_pad_frame_numbers = 4
+    # mmacieje: Previews go elsewhere, lest they overwrite finals. Every
+    # Sequence gets a directory of its own, lest the shots of a manifest
+    # rendered with the same settings overwrite one another (and resume and
+    # the frame cache mistake one's frames for another's).
+    output_root: str = "Saved/MovieRenders/Preview" if preview else "Saved/MovieRenders"
+    output_setting.output_directory = unreal.DirectoryPath(path=f"{{project_dir}}/{output_root}/{{sequence_name}}/{{output_resolution}}_{{ts_count}}_{{ss_count}}_{frame_rate}_{pass_names}")
+    output_setting.file_name_format = f"{{render_pass}}/{{frame_number}}"
+
+    # mmacieje: Configure the deferred pass settings; every pass writes to
+    # its own `{render_pass}` directories.
+    for pass_name, material_ref_list in pass_name_refs_list:
+        deferred_pass_obj = configuration.find_or_add_setting_by_class(deferred_passes_name_type_dict[pass_name])
+
+        # mmacieje: For each material reference, add a post process pass to the deferred pass
+        for material_ref in material_ref_list:
+            post_process_pass = unreal.MoviePipelinePostProcessPass()
+            post_process_pass.enabled = True
+            post_process_pass.material = unreal.load_asset(material_ref)
+            deferred_pass_obj.additional_post_process_materials.append(post_process_pass)
+
+        deferred_pass_obj.disable_multisample_effects = True
+        deferred_pass_obj.render_main_pass = True
+
+    # mmacieje: Anti-aliasing settings
+    anti_aliasing_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineAntiAliasingSetting)
+    anti_aliasing_setting.anti_aliasing_method = unreal.AntiAliasingMethod.AAM_NONE
+    anti_aliasing_setting.engine_warm_up_count = engine_warm_up_count
+    anti_aliasing_setting.override_anti_aliasing = True
+    anti_aliasing_setting.render_warm_up_count = render_warm_up_count
+    anti_aliasing_setting.render_warm_up_frames = True
+    anti_aliasing_setting.spatial_sample_count = spatial_sample_count
+    anti_aliasing_setting.temporal_sample_count = temporal_sample_count
+    anti_aliasing_setting.use_camera_cut_for_warm_up = False
+
+    # mmacieje: EXR image sequence output settings
+    exr_output_configuration = configuration.find_or_add_setting_by_class(unreal.MoviePipelineImageSequenceOutput_EXR)
+    exr_output_configuration.compression = unreal.EXRCompressionFormat.PIZ
+    total_sample_count_threshold: int = 128
+    if spatial_sample_count * temporal_sample_count == total_sample_count_threshold:
+        exr_output_configuration.compression = unreal.EXRCompressionFormat.ZIP
+    exr_output_configuration.multilayer = multilayer
+
+    # mmacieje: Console variable settings
+    console_variable_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineConsoleVariableSetting)
+    for console_var, value in console_variables.items():
+        console_variable_setting.add_or_update_console_variable(console_var, value)
+
+    # mmacieje: Game override settings
+    game_override = configuration.find_or_add_setting_by_class(unreal.MoviePipelineGameOverrideSetting)
+    game_override.cinematic_quality_settings = not preview
+    game_override.disable_hlo_ds = True
+    game_override.flush_grass_streaming = False
+    game_override.flush_streaming_managers = not preview
+    game_override.game_mode_override
+    game_override.override_view_distance_scale = True
+    game_override.override_virtual_texture_feedback_factor = True
+    game_override.shadow_distance_scale
+    game_override.shadow_radius_threshold
+    game_override.texture_streaming = unreal.MoviePipelineTextureStreamingMethod.NONE if preview else unreal.MoviePipelineTextureStreamingMethod.FULLY_LOAD
+    game_override.use_high_quality_shadows = not preview
+    game_override.use_lod_zero = not preview
+    game_override.view_distance_scale
+    game_override.virtual_texture_feedback_factor
+
+    # mmacieje: Initialize any transient settings and assign the configuration
+    configuration.initialize_transient_settings()
+    job.set_configuration(configuration)
+
+
+def content_roots() -> Dict[str, str]:
+    # mmacieje: Mount points whose packages are files we can hash; this
+    # plug-in's own content sits right above this very file.
+    return {
+        "/Game/": unreal.Paths.convert_relative_path_to_full(unreal.Paths.project_content_dir()),
+        "/Executor/": os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    }
+
+
+def dependency_packages(package_names: List[str], mount_points: List[str]) -> Set[str]:
+    # mmacieje: Everything the given packages reference, transitively, as far
+    # as the asset registry knows; engine packages are not walked into.
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    dependency_options = unreal.AssetRegistryDependencyOptions(include_soft_package_references=True, include_hard_package_references=True, include_searchable_names=False, include_soft_management_references=False, include_hard_management_references=False)
+
+    packages: Set[str] = set()
+    pending: List[str] = list(package_names)
+    while pending:
+        package_name = pending.pop()
+        if package_name in packages:
+            continue
+        packages.add(package_name)
+        if any(package_name.startswith(mount_point) for mount_point in mount_points):
+            pending += [str(dependency) for dependency in asset_registry.get_dependencies(package_name, dependency_options) or []]
+    return packages
+
+
+def fingerprint_job(parameters: Dict[str, Any], hash_memo: Dict[str, Any]) -> str:
+    # mmacieje: See `framecache.py`. The frame range is left out on purpose,
+    # a frame being the same frame whichever range it was rendered as part
+    # of; the executor itself is not, as it turns parameters into settings.
+    roots = content_roots()
+    material_refs = [material_ref for _pass_name, material_names in parameters["deferred_passes"] for material_ref in material_refs_of(material_names)]
+    package_names = [ref.split(".", 1)[0] for ref in [parameters["map_ref"], parameters["sequence_ref"]] + material_refs if ref]
+    package_paths = [path for package_name in dependency_packages(package_names, list(roots)) for path in framecache.package_files(package_name, roots)]
+
+    with open(os.path.abspath(__file__), "rb") as executor_file:
+        executor_digest = hashlib.sha1(executor_file.read()).hexdigest()
+    fingerprinted_parameters = {name: value for name, value in parameters.items() if name not in ("start_frame", "end_frame", "preview_stride")}
+    fingerprinted_parameters.update({"engine_version": unreal.SystemLibrary.get_engine_version(), "executor": executor_digest})
+    return framecache.fingerprint(framecache.hash_files(package_paths, hash_memo), fingerprinted_parameters)
+
+
+def find_active_movie_pipeline() -> Optional[unreal.MoviePipeline]:
+    # mmacieje: There is only ever a handful of `MoviePipeline` objects alive,
+    # those of finished jobs lingering until garbage collection, so walking
+    # them once per tick is cheap; the one producing frames is ours.
+    for movie_pipeline in unreal.ObjectIterator(unreal.MoviePipeline):
+        if unreal.MoviePipelineLibrary.get_pipeline_state(movie_pipeline) == unreal.MovieRenderPipelineState.PRODUCING_FRAMES:
+            return movie_pipeline
+    return None
+
+
+# NOTE(mmacieje): Python-defined `UClass`es only hold `uproperty`s, so plain
+# Python objects the executor needs between ticks live here instead (see the
+# note in `kickoff.py`).
+job_telemetry: Optional[telemetry.Telemetry] = None
+output_pipelines: List[postprocess.OutputPipeline] = []
+restored_frame_paths: Dict[str, List[str]] = {}
+warm_up_calibration: Optional[warmup.Calibration] = None
+
 
 @unreal.uclass()
 class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
     job_idx = unreal.uproperty(int)
+    job_order = unreal.uproperty(unreal.Array(int))
+    job_origins = unreal.uproperty(unreal.Array(int))
+    resume_ledger_path = unreal.uproperty(str)
     queue_that_is_constructed = unreal.uproperty(unreal.MoviePipelineQueue)
     queue_that_is_processed = unreal.uproperty(unreal.MoviePipelineQueue)
     pie_executor_that_truly_executes = unreal.uproperty(unreal.MoviePipelinePIEExecutor)
+    daemon = unreal.uproperty(bool)
+    daemon_job_id = unreal.uproperty(str)
+    daemon_backlog = unreal.uproperty(unreal.Array(str))
+    daemon_quit_requested = unreal.uproperty(bool)
+    telemetry_enabled = unreal.uproperty(bool)
+    telemetry_directory = unreal.uproperty(str)
+    post_process_config_path = unreal.uproperty(str)
+    job_output_directory = unreal.uproperty(str)
+    memory_limit = unreal.uproperty(int)
+    recycle_path = unreal.uproperty(str)
+    calibrate_warm_up = unreal.uproperty(bool)
+    frame_cache_directory = unreal.uproperty(str)
+    frame_cache_mode = unreal.uproperty(str)
+    job_fingerprints = unreal.uproperty(unreal.Array(str))
+    job_started_at = unreal.uproperty(float)
+    nothing_left_to_render = unreal.uproperty(bool)
+    failed_job_origins = unreal.uproperty(unreal.Array(int))
+    prefetch_enabled = unreal.uproperty(bool)
 
     def _post_init(self) -> None:
         self.job_idx = -1
+        self.job_order = []
+        self.job_origins = []
+        self.resume_ledger_path = ""
         self.queue_that_is_constructed = None
         self.queue_that_is_processed = None
         self.pie_executor_that_truly_executes = None
+        self.daemon = False
+        self.daemon_job_id = ""
+        self.daemon_backlog = []
+        self.daemon_quit_requested = False
+        self.telemetry_enabled = False
+        self.telemetry_directory = ""
+        self.post_process_config_path = ""
+        self.job_output_directory = ""
+        self.memory_limit = 0
+        self.recycle_path = ""
+        self.calibrate_warm_up = False
+        self.frame_cache_directory = ""
+        self.frame_cache_mode = framecache.COPY
+        self.job_fingerprints = []
+        self.job_started_at = 0.0
+        self.nothing_left_to_render = False
+        self.failed_job_origins = []
+        self.prefetch_enabled = False
 
     @unreal.ufunction(override=True)
     def is_rendering(self) -> bool:
@@ -47,21 +476,33 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
 
         # NOTE(mmacieje): `active_movie_pipeline` property is `Transient`, not
         # `BlueprintReadWrite` and thus cannot be used here; you may want to
-        # modify its kind in `MoviePipelineLinearExecutor.h` file.
-        #
-        #     movie_pipeline = self.pie_executor_that_truly_executes.active_movie_pipeline
-        #     if movie_pipeline:
-        #         pipeline_state = unreal.MoviePipelineLibrary.get_pipeline_state(movie_pipeline)
-        #         shot_state = unreal.MoviePipelineLibrary.get_current_segment_state(movie_pipeline)
-        #         if pipeline_state == unreal.MovieRenderPipelineState.PRODUCING_FRAMES and shot_state == unreal.MovieRenderShotState.RENDERING:
-        #             metrics = unreal.MoviePipelineLibrary.get_current_segment_work_metrics(movie_pipeline)
-        #             frame_idx, frame_count = unreal.MoviePipelineLibrary.get_overall_output_frames(movie_pipeline)
-        #             aa_setting = unreal.MoviePipelineLibrary.find_or_get_default_setting_for_shot(unreal.MoviePipelineAntiAliasingSetting, movie_pipeline.get_pipeline_primary_config(), unreal.MoviePipelineLibrary.get_current_executor_shot(movie_pipeline))
-        #             spatial_sample_count = aa_setting.spatial_sample_count 
-        #             sub_sample_idx = metrics.output_sub_sample_index + spatial_sample_count + 1
-        #             sub_sample_count = metrics.total_sub_sample_count
-        #             unreal.log(f"Sample -> ({frame_idx}/{frame_count}) ~ Sub-sample -> [{sub_sample_idx}/{sub_sample_count}]")
-        #
+        # modify its kind in `MoviePipelineLinearExecutor.h` file. Instead, we
+        # look the pipeline up among live objects, see
+        # `find_active_movie_pipeline`.
+        if not self.pie_executor_that_truly_executes:
+            return
+        if not self.telemetry_enabled and not warm_up_calibration and timeline.has(timeline.FIRST_FRAME):
+            return
+
+        movie_pipeline = find_active_movie_pipeline()
+        if not movie_pipeline:
+            return
+
+        shot_state = unreal.MoviePipelineLibrary.get_current_segment_state(movie_pipeline)
+        metrics = unreal.MoviePipelineLibrary.get_current_segment_work_metrics(movie_pipeline)
+        if shot_state == unreal.MovieRenderShotState.WARMING_UP:
+            phase = telemetry.WARM_UP
+            if warm_up_calibration:
+                warm_up_calibration.record(metrics.engine_warm_up_frame_index < metrics.total_engine_warm_up_frame_count)
+        elif shot_state == unreal.MovieRenderShotState.RENDERING:
+            phase = telemetry.PRODUCING_FRAMES
+            timeline.mark(timeline.FIRST_FRAME)
+        else:
+            return
+
+        frame_idx, frame_count = unreal.MoviePipelineLibrary.get_overall_output_frames(movie_pipeline)
+        if job_telemetry:
+            job_telemetry.record(phase, frame_idx, frame_count, metrics.output_sub_sample_index, metrics.total_sub_sample_count)
 
     @unreal.ufunction(override=True)
     def execute_delayed(self, queue: Any) -> None:
@@ -70,35 +511,96 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
         # mmacieje: Parse the command line into tokens, switches, and arguments
         cmdln_tokens, cmdln_switches, cmdln_args = unreal.SystemLibrary.parse_command_line(unreal.SystemLibrary.get_command_line())
 
-        def find_needle(haysack: List[Any], needle: Any) -> bool:
-            result = False
-            for item in haysack:
-                if item == needle:
-                    result = True
-                    break
-            return result
+        # mmacieje: In daemon mode, connect to the dispatcher first so that
+        # the job given on the command line, if any, is reported as well.
+        self.daemon = find_needle(cmdln_switches, "Daemon")
+        if self.daemon:
+            daemon_host: str = str(cmdln_args.get("DaemonHost", "127.0.0.1"))
+            daemon_port: int = int(cmdln_args.get("DaemonPort", DAEMON_PORT))
+            if not self.connect_socket(daemon_host, daemon_port):
+                unreal.log_error(f"Could not connect to the dispatcher at {daemon_host}:{daemon_port}!")
+                self.on_executor_errored_impl()
+                return
+            self.socket_message_recieved_delegate.add_function_unique(self, "on_socket_message_received")
+
+        # mmacieje: Per-tick telemetry, one JSONL file and one summary per job
+        self.telemetry_enabled = find_needle(cmdln_switches, "Telemetry")
+        self.telemetry_directory = str(cmdln_args.get("TelemetryDirectory", os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "Telemetry")))
+
+        # mmacieje: Post-processing of frames as they land, if configured;
+        # a broken configuration is better found now than after the first job.
+        self.post_process_config_path = str(cmdln_args.get("PostProcess", ""))
+        if self.post_process_config_path:
+            try:
+                postprocess.load_config(self.post_process_config_path)
+            except (OSError, ValueError) as exception:
+                unreal.log_error(f"Post-processing configuration '{self.post_process_config_path}' is invalid: {exception}")
+                self.on_executor_errored_impl()
+                return
+
+        # mmacieje: Measure warm-up rather than use cached counts; see
+        # `warmup.py`.
+        self.calibrate_warm_up = find_needle(cmdln_switches, "CalibrateWarmUp")
+
+        # mmacieje: Frames that have not changed since an earlier run come from
+        # the frame cache; see `framecache.py`.
+        if find_needle(cmdln_switches, "FrameCache"):
+            self.frame_cache_directory = str(cmdln_args.get("FrameCacheDirectory", os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "FrameCache")))
+            self.frame_cache_mode = str(cmdln_args.get("FrameCacheMode", framecache.COPY)).lower()
+            if self.frame_cache_mode not in (framecache.COPY, framecache.LINK):
+                unreal.log_error(f"Unknown `FrameCacheMode` '{self.frame_cache_mode}'!")
+                self.on_executor_errored_impl()
+                return
+
+        # mmacieje: Load what the jobs need before the first one starts; see
+        # `preflight.py`.
+        self.prefetch_enabled = find_needle(cmdln_switches, "Prefetch")
+
+        # mmacieje: Memory watchdog; see `should_recycle`. A daemon has no
+        # one to relaunch it, so it is left alone.
+        self.memory_limit = int(cmdln_args.get("MemoryLimit", 0)) * 1024 * 1024
+        self.recycle_path = str(cmdln_args.get("RecycleFile", os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "Recycle.json")))
+        if self.memory_limit and self.daemon:
+            unreal.log_warning("`-MemoryLimit` is ignored in daemon mode.")
+            self.memory_limit = 0
+
+        # mmacieje: A daemon may well be started without any workload and
+        # wait for the dispatcher to send one.
+        if not self.daemon or has_workload(cmdln_args):
+            if self.construct_queue(cmdln_switches, cmdln_args):
+                self.start_job_by_index(0)
+                return
+
+        # mmacieje: Nothing to render, e.g. everything has been rendered
+        # before `-Resume`; do not keep the editor around for nothing.
+        if self.daemon:
+            self.report_status("idle")
+        else:
+            # mmacieje: Frames the frame cache restored may still be
+            # post-processed.
+            self.report_output_pipelines(wait=True)
+            self.on_executor_finished_impl()
+
+    def construct_queue(self, cmdln_switches: List[str], cmdln_args: Dict[str, Any]) -> bool:
+        # mmacieje: Nothing of the previous (daemon) job may outlive a
+        # workload that fails to construct; `report_status` looks at these.
+        self.job_idx = -1
+        self.job_origins = []
+        self.failed_job_origins = []
+        self.nothing_left_to_render = False
+        restored_frame_paths.clear()
 
         # mmacieje: Extract command-line arguments, converting to proper types and providing defaults
+        warm_up_cache: Optional[Dict[str, Any]] = None if self.calibrate_warm_up else warmup.load_cache(warm_up_cache_path())
+        parameters: Dict[str, Any] = parse_job_parameters(cmdln_switches, cmdln_args, warm_up_cache)
         queue_ref: str = str(cmdln_args.get("Queue", ""))
         configuration_ref: str = str(cmdln_args.get("Configuration", ""))
-        sequence_ref: str = str(cmdln_args.get("Sequence", ""))
-        width: int = int(cmdln_args.get("Width", 1920))
-        height: int = int(cmdln_args.get("Height", 1080))
-        start_frame: int = int(cmdln_args.get("StartFrame", -1))
-        end_frame: int = int(cmdln_args.get("EndFrame", -1))
-        frame_rate: int = int(cmdln_args.get("FrameRate", 30))
-        temporal_sample_count: int = int(cmdln_args.get("TemporalSampleCount", 1))
-        spatial_sample_count: int = int(cmdln_args.get("SpatialSampleCount", 1))
-        deferred_pass: str = str(cmdln_args.get("DeferredPass", "Base")).lower()
-        materials: str = cmdln_args.get("Materials", "")
-        multilayer: bool = find_needle(cmdln_switches, "Multilayer")
-        engine_warm_up_count: int = int(cmdln_args.get("EngineWarmUpCount", 101))
-        render_warm_up_count: int = int(cmdln_args.get("RenderWarmUpCount", 97))
-
-        # mmacieje: Get the current map reference from the editor world.
-        world_ref = unreal.EditorLevelLibrary.get_editor_world()
-        package_ref = world_ref.get_outer()
-        map_ref: str = package_ref.get_path_name()
+        sequence_ref: str = parameters["sequence_ref"]
+        manifest_ref: str = str(cmdln_args.get("Manifest", ""))
+
+        # mmacieje: Get the map reference, the current editor world's unless
+        # `-Map` says otherwise.
+        map_ref: str = parameters["map_ref"]
 
         # mmacieje: Determine the type of workload based on which command-line arguments are provided
         workload_kind: int = -1
@@ -108,134 +610,105 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
             workload_kind = CONFIGURATION
         if queue_ref:
             workload_kind = QUEUE
+        if manifest_ref:
+            workload_kind = MANIFEST
 
         workload_good: bool = False
+        job_parameters: List[Dict[str, Any]] = []
+
+        # mmacieje: Whatever the previous daemon job held on to
+        preflight.release()
+        current_map_ref: str = current_map_package_name()
 
         # mmacieje: Configure the rendering job based on the workload type
         match workload_kind:
             # mmacieje: SEQUENCE
             case 0:
-                # mmacieje: Create a new movie pipeline queue and allocate a job
-                self.queue_that_is_constructed = unreal.MoviePipelineQueue()
-                job = self.queue_that_is_constructed.allocate_new_job()
-
-                # mmacieje: Set metadata and asset references for the job
-                job.comment = "Install and repair pipes and fixtures that carry water, gas, or other fluids in homes and businesses"
-                job.job_name = "Plumber"
-                job.map = unreal.SoftObjectPath(map_ref)
-                job.sequence = unreal.SoftObjectPath(sequence_ref)
-
-                configuration = job.get_configuration()
-
-                # mmacieje: High-resolution rendering settings
-                high_resolution_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineHighResSetting)
-                high_resolution_setting.allocate_history_per_tile = True
-                high_resolution_setting.burley_sample_count = 64
-                high_resolution_setting.overlap_ratio = 0
-                high_resolution_setting.override_sub_surface_scattering = True
-                high_resolution_setting.texture_sharpness_bias = 0
-                high_resolution_setting.tile_count = 1
-
-                # mmacieje: Output settings
-                output_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineOutputSetting)
-                output_setting.use_custom_playback_range = start_frame != -1 and end_frame != -1
-                output_setting.custom_end_frame = end_frame
-                output_setting.custom_start_frame = start_frame
-                output_setting.output_resolution = unreal.IntPoint(width, height)
-                output_setting.use_custom_frame_rate = True
-                output_setting.output_frame_rate = unreal.FrameRate(numerator=frame_rate)
-                output_setting.zero_pad_frame_numbers = 4
-                output_setting.output_directory = unreal.DirectoryPath(path=f"{{project_dir}}/Saved/MovieRenders/{{output_resolution}}_{{ts_count}}_{{ss_count}}_{frame_rate}_{deferred_pass}")
-                output_setting.file_name_format = f"{{render_pass}}/{{frame_number}}"
-
-                # mmacieje: Configure the deferred pass settings
-                deferred_pass_obj = configuration.find_or_add_setting_by_class(deferred_passes_name_type_dict[deferred_pass])
-                material_name_list: List[str] = [item.strip() for item in materials.split(",") if item.strip()]
-                material_ref_list: List[str] = []
-                for material_name in material_name_list:
-                    material_ref = materials_name_ref_dict.get(material_name.lower())
-                    if material_ref:
-                        material_ref_list.append(material_ref)
-
-                # mmacieje: For each material reference, add a post process pass to the deferred pass
-                for material_ref in material_ref_list:
-                    post_process_pass = unreal.MoviePipelinePostProcessPass()
-                    post_process_pass.enabled = True
-                    post_process_pass.material = unreal.load_asset(material_ref)
-                    deferred_pass_obj.additional_post_process_materials.append(post_process_pass)
-
-                deferred_pass_obj.disable_multisample_effects = True
-                deferred_pass_obj.render_main_pass = True
-
-                # mmacieje: Anti-aliasing settings
-                anti_aliasing_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineAntiAliasingSetting)
-                anti_aliasing_setting.anti_aliasing_method = unreal.AntiAliasingMethod.AAM_NONE
-                anti_aliasing_setting.engine_warm_up_count = engine_warm_up_count
-                anti_aliasing_setting.override_anti_aliasing = True
-                anti_aliasing_setting.render_warm_up_count = render_warm_up_count
-                anti_aliasing_setting.render_warm_up_frames = True
-                anti_aliasing_setting.spatial_sample_count = spatial_sample_count
-                anti_aliasing_setting.temporal_sample_count = temporal_sample_count
-                anti_aliasing_setting.use_camera_cut_for_warm_up = False
-
-                # mmacieje: EXR image sequence output settings
-                exr_output_configuration = configuration.find_or_add_setting_by_class(unreal.MoviePipelineImageSequenceOutput_EXR)
-                exr_output_configuration.compression = unreal.EXRCompressionFormat.PIZ
-                total_sample_count_threshold: int = 128
-                if spatial_sample_count * temporal_sample_count == total_sample_count_threshold:
-                    exr_output_configuration.compression = unreal.EXRCompressionFormat.ZIP
-                exr_output_configuration.multilayer = multilayer
-
-                # mmacieje: Console variable settings
-                console_variable_setting = configuration.find_or_add_setting_by_class(unreal.MoviePipelineConsoleVariableSetting)
-                for console_var, value in console_vars_name_value_dict.items():
-                    console_variable_setting.add_or_update_console_variable(console_var, value)
-
-                # mmacieje: Game override settings
-                game_override = configuration.find_or_add_setting_by_class(unreal.MoviePipelineGameOverrideSetting)
-                game_override.cinematic_quality_settings = True
-                game_override.disable_hlo_ds = True
-                game_override.flush_grass_streaming = False
-                game_override.flush_streaming_managers = True
-                game_override.game_mode_override
-                game_override.override_view_distance_scale = True
-                game_override.override_virtual_texture_feedback_factor = True
-                game_override.shadow_distance_scale
-                game_override.shadow_radius_threshold
-                game_override.texture_streaming = unreal.MoviePipelineTextureStreamingMethod.FULLY_LOAD
-                game_override.use_high_quality_shadows = True
-                game_override.use_lod_zero = True
-                game_override.view_distance_scale
-                game_override.virtual_texture_feedback_factor
-
-                # mmacieje: Initialize any transient settings and assign the configuration
-                configuration.initialize_transient_settings()
-                job.set_configuration(configuration)
-
-                workload_good = True
+                problems = validate_job_parameters(parameters)
+                problems += preflight.check_job(map_ref, sequence_ref, job_material_refs(parameters), current_map_ref)
+                if problems:
+                    unreal.log_error("Job is invalid:\n" + "\n".join(problems))
+                else:
+                    # mmacieje: Create a new movie pipeline queue and allocate a job
+                    self.queue_that_is_constructed = unreal.MoviePipelineQueue()
+                    job = self.queue_that_is_constructed.allocate_new_job()
+
+                    populate_sequence_job(job, parameters)
+                    job_parameters = [parameters]
+
+                    workload_good = True
 
             # mmacieje: CONFIGURATION
             case 1:
-                # mmacieje: Create a new job and load a pre-existing configuration asset
-                self.queue_that_is_constructed = unreal.MoviePipelineQueue()
-                job = self.queue_that_is_constructed.allocate_new_job()
-                job.comment = "Measure, cut, and shape wood, plastic, and other materials"
-                job.job_name = "Carpenter"
-                job.map = unreal.SoftObjectPath(map_ref)
-                job.sequence = unreal.SoftObjectPath(sequence_ref)
+                problems = preflight.check_asset("configuration", configuration_ref, preflight.CONFIGURATION_CLASS_NAMES)
+                problems += preflight.check_job(map_ref, sequence_ref, [], current_map_ref)
+                if problems:
+                    unreal.log_error("Job is invalid:\n" + "\n".join(problems))
+                else:
+                    # mmacieje: Create a new job and load a pre-existing configuration asset
+                    self.queue_that_is_constructed = unreal.MoviePipelineQueue()
+                    job = self.queue_that_is_constructed.allocate_new_job()
+                    job.comment = "Measure, cut, and shape wood, plastic, and other materials"
+                    job.job_name = "Carpenter"
+                    job.map = unreal.SoftObjectPath(map_ref)
+                    job.sequence = unreal.SoftObjectPath(sequence_ref)
 
-                configuration = unreal.EditorAssetLibrary.load_asset(configuration_ref)
-                configuration.initialize_transient_settings()
-                job.set_configuration(configuration)
-
-                workload_good = bool(configuration)
+                    configuration = unreal.EditorAssetLibrary.load_asset(configuration_ref)
+                    problems = preflight.check_configuration(configuration) if configuration else [f"configuration '{configuration_ref}' could not be loaded"]
+                    if problems:
+                        unreal.log_error("Job is invalid:\n" + "\n".join(problems))
+                    else:
+                        configuration.initialize_transient_settings()
+                        job.set_configuration(configuration)
+                        workload_good = True
 
             # mmacieje: QUEUE
             case 2:
-                # mmacieje: Load an entire queue asset from the provided reference
-                self.queue_that_is_constructed = unreal.EditorAssetLibrary.load_asset(queue_ref)
-                jobs = self.queue_that_is_constructed.get_jobs()
-                workload_good = bool(jobs)
+                # mmacieje: A queue asset is small; what its jobs refer to is
+                # not, hence checked before going any further.
+                problems = preflight.check_asset("queue", queue_ref, preflight.QUEUE_CLASS_NAMES)
+                if not problems:
+                    # mmacieje: Load an entire queue asset from the provided reference
+                    self.queue_that_is_constructed = unreal.EditorAssetLibrary.load_asset(queue_ref)
+                    jobs = self.queue_that_is_constructed.get_jobs()
+                    for job_idx, job in enumerate(jobs):
+                        problems += [f"job {job_idx}: {problem}" for problem in preflight.check_job(job.map.export_text(), job.sequence.export_text(), [], current_map_ref)]
+                        problems += [f"job {job_idx}: {problem}" for problem in preflight.check_configuration(job.get_configuration())]
+                    workload_good = bool(jobs) and not problems
+                if problems:
+                    unreal.log_error(f"Queue '{queue_ref}' is invalid:\n" + "\n".join(problems))
+
+            # mmacieje: MANIFEST
+            case 3:
+                # mmacieje: Parse and validate every entry before a single job
+                # is built, so that a typo in the last entry does not surface
+                # hours into the batch.
+                entry_parameters: List[Dict[str, Any]] = []
+                problems: List[str] = []
+                try:
+                    entries = load_manifest(manifest_ref)
+                except (OSError, ValueError) as exception:
+                    entries = []
+                    problems.append(str(exception))
+
+                for entry_idx, entry in enumerate(entries):
+                    try:
+                        entry_parameters.append(parse_job_parameters(*inherit_parameters(*job_to_command_line(entry), cmdln_switches, cmdln_args), warm_up_cache))
+                    except (TypeError, ValueError, AttributeError) as exception:
+                        problems.append(f"entry {entry_idx}: {exception}")
+                        continue
+                    problems += [f"entry {entry_idx}: {problem}" for problem in validate_job_parameters(entry_parameters[-1])]
+                    problems += [f"entry {entry_idx}: {problem}" for problem in preflight.check_job(entry_parameters[-1]["map_ref"], entry_parameters[-1]["sequence_ref"], job_material_refs(entry_parameters[-1]), current_map_ref)]
+
+                if problems:
+                    unreal.log_error(f"Manifest '{manifest_ref}' is invalid:\n" + "\n".join(problems))
+                else:
+                    # mmacieje: Build every entry into the one queue
+                    self.queue_that_is_constructed = unreal.MoviePipelineQueue()
+                    for parameters in entry_parameters:
+                        populate_sequence_job(self.queue_that_is_constructed.allocate_new_job(), parameters)
+                    job_parameters = entry_parameters
+                    workload_good = bool(entry_parameters)
 
             case _:
                 raise RuntimeError("Unreachable!")
@@ -249,11 +722,170 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
         unreal.log(f"Now, it is: '{self.user_data}'.")
 
         if workload_good:
-            self.start_job_by_index(0)
+            self.job_origins = list(range(len(self.queue_that_is_constructed.get_jobs())))
+
+            # mmacieje: The ledger is kept whether or not we resume, so that
+            # the next run can.
+            self.resume_ledger_path = resume.ledger_path(str(cmdln_args.get("ResumeKey", "")) or resume.workload_key(cmdln_switches, cmdln_args, map_ref))
+            if find_needle(cmdln_switches, "Resume"):
+                workload_good = self.resume_jobs()
+            else:
+                resume.start_run(self.resume_ledger_path)
+
+        # mmacieje: Only SEQUENCE and MANIFEST jobs are built from parameters
+        # we can fingerprint; assets may hold anything.
+        self.job_fingerprints = []
+        if workload_good and self.frame_cache_directory:
+            if job_parameters:
+                hash_memo = framecache.load_memo(self.frame_cache_directory)
+                self.job_fingerprints = [fingerprint_job(parameters, hash_memo) for parameters in job_parameters]
+                framecache.save_memo(self.frame_cache_directory, hash_memo)
+                workload_good = self.consult_frame_cache()
+            else:
+                unreal.log_warning("The frame cache only serves `Sequence` and `Manifest` workloads; rendering everything.")
+
+        # mmacieje: Only what is left to render after resuming and consulting
+        # the frame cache; materials were loaded by `populate_sequence_job`
+        # already. Opt-in, as it moves loading before the first frame rather
+        # than overlapping it with rendering.
+        if workload_good and self.prefetch_enabled:
+            problems = preflight.prefetch([job.sequence.export_text() for job in self.queue_that_is_constructed.get_jobs()])
+            if problems:
+                unreal.log_error("Prefetching failed:\n" + "\n".join(problems))
+                workload_good = False
+
+        if workload_good:
+            self.schedule_jobs(workload_kind)
+
+        return workload_good
+
+    def resume_jobs(self) -> bool:
+        finished_jobs = resume.load_finished_jobs(self.resume_ledger_path)
+        started_at = resume.run_started_at(self.resume_ledger_path)
+        resumed_queue = unreal.MoviePipelineQueue()
+        job_origins: List[int] = []
+
+        for job_idx, job in enumerate(self.queue_that_is_constructed.get_jobs()):
+            if job_idx in finished_jobs:
+                unreal.log(f"Job {job_idx} has already been rendered; skipping it.")
+                continue
+
+            # mmacieje: Narrow the job down to the frames this run has not
+            # written yet, or render it whole if we cannot tell which those
+            # are. Frames older than the run are not ours to trust.
+            frame_range = resume.job_frame_range(job)
+            done_frames = frames.complete_frames(resume.resolve_output_directory(job), newer_than=started_at) if frame_range and started_at else set()
+            if not done_frames:
+                resumed_queue.duplicate_job(job)
+                job_origins.append(job_idx)
+                continue
+
+            spans = frames.missing_spans(frame_range[0], frame_range[1], done_frames)
+            if not spans:
+                unreal.log(f"Job {job_idx} has all of its frames on disk; skipping it.")
+                resume.mark_job_finished(self.resume_ledger_path, job_idx)
+                continue
+
+            unreal.log(f"Job {job_idx} is missing frame(s) {frames.format_frames(frame for span in spans for frame in range(*span))}; rendering those only.")
+            job_origins += [job_idx] * resume.narrow_job(resumed_queue, job, spans)
+
+        self.queue_that_is_constructed = resumed_queue
+        self.job_origins = job_origins
+
+        if not job_origins:
+            unreal.log("Nothing left to resume.")
+            self.nothing_left_to_render = True
+        return bool(job_origins)
+
+    def consult_frame_cache(self) -> bool:
+        cached_queue = unreal.MoviePipelineQueue()
+        job_origins: List[int] = []
+        cached_jobs: Set[int] = set()
+
+        for queue_job_idx, job in enumerate(self.queue_that_is_constructed.get_jobs()):
+            job_idx: int = self.job_origins[queue_job_idx]
+            frame_range = resume.job_frame_range(job)
+            if not frame_range:
+                cached_queue.duplicate_job(job)
+                job_origins.append(job_idx)
+                continue
+
+            output_directory = resume.resolve_output_directory(job)
+            hits = framecache.restore(self.frame_cache_directory, self.job_fingerprints[job_idx], output_directory, range(*frame_range), self.frame_cache_mode)
+            spans = frames.missing_spans(frame_range[0], frame_range[1], hits)
+            framecache.remove_frames(output_directory, {frame for span in spans for frame in range(*span)})
+
+            # mmacieje: Restored frames predate the job's output pipeline,
+            # which would take them for leftovers; see below.
+            if hits and self.post_process_config_path:
+                restored_frame_paths.setdefault(output_directory, []).extend(frames.frame_paths(output_directory, hits))
+
+            if not hits:
+                cached_queue.duplicate_job(job)
+                job_origins.append(job_idx)
+            elif not spans:
+                unreal.log(f"Job {job_idx} has all of its frames in the frame cache; skipping it.")
+                cached_jobs.add(job_idx)
+            else:
+                unreal.log(f"Job {job_idx} took frame(s) {frames.format_frames(hits)} from the frame cache; rendering the rest only.")
+                job_origins += [job_idx] * resume.narrow_job(cached_queue, job, spans)
+
+        # mmacieje: A job cut into sub-ranges by `resume_jobs` is finished
+        # only if none of them is left to render.
+        for job_idx in cached_jobs - set(job_origins):
+            resume.mark_job_finished(self.resume_ledger_path, job_idx)
+
+        self.queue_that_is_constructed = cached_queue
+        self.job_origins = job_origins
+
+        # mmacieje: Restored frames go to the output pipeline of the first job
+        # rendering into the same directory (see `start_job_by_index`), or to
+        # one of their own if no job is left to.
+        rendered_directories: Set[str] = set(resume.resolve_output_directory(job) for job in cached_queue.get_jobs())
+        for output_directory in [output_directory for output_directory in restored_frame_paths if output_directory not in rendered_directories]:
+            output_pipeline = postprocess.OutputPipeline(output_directory, postprocess.load_config(self.post_process_config_path), restored_frame_paths.pop(output_directory))
+            output_pipeline.finish()
+            output_pipelines.append(output_pipeline)
+
+        if not job_origins:
+            unreal.log("Every frame came from the frame cache.")
+            self.nothing_left_to_render = True
+        return bool(job_origins)
+
+    def schedule_jobs(self, workload_kind: int) -> None:
+        jobs = self.queue_that_is_constructed.get_jobs()
+        job_order: List[int] = list(range(len(jobs)))
+
+        # mmacieje: Loading a map is the most expensive thing we do between
+        # jobs and leaks world memory on top of that (see the note in
+        # `start_job_by_index`), so jobs sharing a map are rendered one after
+        # another, starting with the map that is already open. Jobs keep their
+        # relative order within a group.
+        if workload_kind in (QUEUE, MANIFEST):
+            current_map_ref: str = current_map_package_name()
+            map_refs: List[str] = [unreal.MoviePipelineLibrary.get_map_package_name(job) for job in jobs]
+            map_ranks: Dict[str, int] = {}
+            for map_ref in map_refs:
+                map_ranks.setdefault(map_ref, -1 if map_ref == current_map_ref else len(map_ranks))
+            job_order.sort(key=lambda job_idx: map_ranks[map_refs[job_idx]])
+            unreal.log(f"Rendering {len(jobs)} job(s) across {len(map_ranks)} map(s) in this order: {job_order}.")
+
+        self.job_order = job_order
+        self.job_idx = -1
+
+    def queue_job_idx(self) -> int:
+        # mmacieje: `job_idx` is a position in `job_order`; this is the index
+        # of the job within `queue_that_is_constructed`.
+        return self.job_order[self.job_idx]
+
+    def original_job_idx(self) -> int:
+        # mmacieje: ...and this is the index of the job it came from before
+        # `resume_jobs` cut it into sub-ranges, the one worth reporting.
+        return self.job_origins[self.queue_job_idx()]
 
     @unreal.ufunction(ret=None, params=[int])
     def start_job_by_index(self, idx: int) -> None:
-        if idx >= len(self.queue_that_is_constructed.get_jobs()):
+        if idx >= len(self.job_order):
             unreal.log_error("Out of Bounds Job Index!")
             self.on_executor_errored_impl()
             return
@@ -272,15 +904,24 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
         #
         # (*) Alright, fiddling with `user_data` continued
         workload_kind = eval(self.user_data)
-        if workload_kind == QUEUE:
-            # mmacieje: Retrieve the map package name associated with the job
-            map_ref = unreal.MoviePipelineLibrary.get_map_package_name(self.queue_that_is_constructed.get_jobs()[self.job_idx])
 
+        # mmacieje: Retrieve the map package name associated with the job. Any
+        # workload kind may name a map other than the open one (`-Map`, a
+        # daemon job's `Map`, a queue's jobs); for QUEUE and MANIFEST,
+        # `schedule_jobs` grouped jobs by map, so most of the time the map is
+        # already open.
+        map_ref = unreal.MoviePipelineLibrary.get_map_package_name(self.queue_that_is_constructed.get_jobs()[self.queue_job_idx()])
+        if map_ref != current_map_package_name():
+            unreal.log(f"Loading map '{map_ref}' for job {self.original_job_idx()} (workload kind {workload_kind}).")
             unreal.EditorLoadingAndSavingUtils.load_map(map_ref)
+        else:
+            unreal.log(f"Map '{map_ref}' is already open; not loading it again.")
+        timeline.mark(timeline.MAP_READY)
 
         # mmacieje: Duplicate the selected job into a separate processing queue
         self.queue_that_is_processed = unreal.MoviePipelineQueue()
-        job = self.queue_that_is_processed.duplicate_job(self.queue_that_is_constructed.get_jobs()[self.job_idx])
+        job = self.queue_that_is_processed.duplicate_job(self.queue_that_is_constructed.get_jobs()[self.queue_job_idx()])
+        self.job_output_directory = resume.resolve_output_directory(job)
 
         # mmacieje: Set up the Play In Editor executor for offscreen rendering
         self.pie_executor_that_truly_executes = unreal.MoviePipelinePIEExecutor()
@@ -290,23 +931,225 @@ class HostExecutor(unreal.MoviePipelinePythonHostExecutor):
         self.pie_executor_that_truly_executes.http_response_recieved_delegate
         self.pie_executor_that_truly_executes.on_executor_errored_delegate
         self.pie_executor_that_truly_executes.on_executor_finished_delegate.add_function_unique(self, "on_individual_job_finished")
-        self.pie_executor_that_truly_executes.on_individual_job_started_delegate
+        self.pie_executor_that_truly_executes.on_individual_job_started_delegate.add_function_unique(self, "on_individual_job_started")
         self.pie_executor_that_truly_executes.on_individual_job_work_finished_delegate
         self.pie_executor_that_truly_executes.on_individual_shot_work_finished_delegate
         self.pie_executor_that_truly_executes.socket_message_recieved_delegate
         self.pie_executor_that_truly_executes.target_pipeline_class
         self.pie_executor_that_truly_executes.user_data
 
+        if self.post_process_config_path:
+            output_pipelines.append(postprocess.OutputPipeline(self.job_output_directory, postprocess.load_config(self.post_process_config_path), restored_frame_paths.pop(self.job_output_directory, [])))
+
+        if self.telemetry_enabled:
+            global job_telemetry
+            job_telemetry = telemetry.Telemetry(os.path.join(self.telemetry_directory, f"{time.strftime('%Y%m%d_%H%M%S')}_{self.original_job_idx()}.jsonl"), self.original_job_idx())
+
+        if self.calibrate_warm_up:
+            global warm_up_calibration
+            anti_aliasing_setting = job.get_configuration().find_or_add_setting_by_class(unreal.MoviePipelineAntiAliasingSetting)
+            warm_up_calibration = warmup.Calibration(
+                warmup.cache_key(unreal.MoviePipelineLibrary.get_map_package_name(job), job.sequence.export_text(), unreal.SystemLibrary.get_engine_version()),
+                anti_aliasing_setting.engine_warm_up_count,
+                anti_aliasing_setting.render_warm_up_count,
+            )
+
+        self.job_started_at = time.time()
         self.pie_executor_that_truly_executes.execute(self.queue_that_is_processed)
 
+    @unreal.ufunction(ret=None, params=[unreal.MoviePipelineExecutorJob])
+    def on_individual_job_started(self, job: Any) -> None:
+        timeline.mark(timeline.PIE_STARTED)
+
     @unreal.ufunction(ret=None, params=[unreal.MoviePipelineExecutorBase, bool])
-    def on_individual_job_finished(self, executor: Any, fatal_error: bool) -> None:
-        unreal.log("Job finished! Job Index: " + str(self.job_idx))
+    def on_individual_job_finished(self, executor: Any, success: bool) -> None:
+        # NOTE(mmacieje): Just like in `kickoff.on_executor_finished`, this
+        # `success` boolean is unreliable; errors are flagged as successful.
+        # It only ever rules out what certainly went wrong; anything that
+        # trusts a job's output looks at the output itself.
+        unreal.log("Job finished! Job Index: " + str(self.original_job_idx()))
         self.queue_that_is_processed = None
 
-        # mmacieje: If more jobs remain in the queue, start the next one
-        if self.job_idx < len(self.queue_that_is_constructed.get_jobs()) - 1:
+        is_last_job: bool = self.job_idx == len(self.job_order) - 1
+        recycling: bool = not is_last_job and self.should_recycle()
+
+        # mmacieje: The startup timeline goes with the first job's output
+        if not timeline.written:
+            record = timeline.write(self.job_output_directory, os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "Timelines.jsonl"))
+            unreal.log("Startup timeline: " + ", ".join(f"{phase} {duration:.2f}s" for phase, duration in record["durations"].items()))
+
+        # mmacieje: Let post-processing catch up in the background; only the
+        # very last job waits for it, lest the editor quits under its feet. A
+        # daemon waits once it is told to quit; see `start_next_daemon_job`.
+        if self.post_process_config_path and output_pipelines:
+            output_pipelines[-1].finish()
+            self.report_output_pipelines(wait=(is_last_job or recycling) and not self.daemon)
+
+        if self.job_fingerprints and success:
+            stored_frames = framecache.store(self.frame_cache_directory, self.job_fingerprints[self.original_job_idx()], self.job_output_directory, self.job_started_at, self.frame_cache_mode)
+            unreal.log(f"Frame cache: stored {len(stored_frames)} frame(s).")
+
+        # mmacieje: A job cut into sub-ranges is finished once its last
+        # sub-range is, and only if none of them failed; a failed job is left
+        # for `-Resume` to render again.
+        if not success:
+            unreal.log_error(f"Job {self.original_job_idx()} failed; not recording it as finished.")
+            if self.original_job_idx() not in self.failed_job_origins:
+                self.failed_job_origins.append(self.original_job_idx())
+        elif self.original_job_idx() not in self.failed_job_origins and self.original_job_idx() not in [self.job_origins[job_idx] for job_idx in self.job_order[self.job_idx + 1:]]:
+            resume.mark_job_finished(self.resume_ledger_path, self.original_job_idx())
+
+        # mmacieje: Let go of prefetched Sequences no job left needs
+        if self.prefetch_enabled:
+            jobs = self.queue_that_is_constructed.get_jobs()
+            preflight.retain([jobs[queue_job_idx].sequence.export_text() for queue_job_idx in self.job_order[self.job_idx + 1:]])
+
+        global warm_up_calibration
+        if warm_up_calibration and success:
+            result = warm_up_calibration.result()
+            warm_up_cache = warmup.load_cache(warm_up_cache_path())
+            warm_up_cache[warm_up_calibration.key] = result
+            warmup.save_cache(warm_up_cache_path(), warm_up_cache)
+            unreal.log(f"Warm-up calibration of '{warm_up_calibration.key}': {result['engine_warm_up_count']} engine and {result['render_warm_up_count']} render warm-up frame(s) (measured {result['measured_engine_ticks']} and {result['measured_render_ticks']} tick(s)).")
+        warm_up_calibration = None
+
+        global job_telemetry
+        if job_telemetry:
+            summary = job_telemetry.close()
+            job_telemetry = None
+            unreal.log(f"Telemetry: {summary['frames']} frame(s) at {summary['frames_per_second']:.3f} frames/s, {summary['warm_up_time']:.1f}s warming up, {summary['producing_frames_time']:.1f}s producing frames, p50/p95 frame latency {summary['frame_latency_p50']:.3f}s/{summary['frame_latency_p95']:.3f}s.")
+
+        # mmacieje: If more jobs remain in the queue, start the next one,
+        # unless it is time for a fresh editor to take over.
+        if recycling:
+            self.recycle()
+        elif not is_last_job:
             self.start_job_by_index(self.job_idx + 1)
+        elif self.daemon:
+            # mmacieje: Stay resident; the editor is warm, so the next job
+            # only pays for its own map load and warm-up.
+            # mmacieje: Any failed job, sub-ranges included, fails the whole
+            # daemon job, not just the last one.
+            self.pie_executor_that_truly_executes = None
+            self.report_status("errored" if self.failed_job_origins else "finished")
+            self.daemon_job_id = ""
+            self.start_next_daemon_job()
         else:
             self.on_executor_finished_impl()
 
+    def should_recycle(self) -> bool:
+        # NOTE(mmacieje): Loading maps leaks world memory that no amount of
+        # garbage collection gets back (see the note in `start_job_by_index`),
+        # so a long queue grows until the node swaps. Rather than fight it,
+        # hand the rest of the queue over to a fresh editor once this one
+        # has grown past `-MemoryLimit`; `supervise.py` does the relaunching.
+        if not self.memory_limit:
+            return False
+        rss: int = telemetry.process_rss()
+        unreal.log(f"Memory watchdog: {rss / (1024 * 1024):.0f} MiB resident, {self.memory_limit / (1024 * 1024):.0f} MiB allowed.")
+        return rss > self.memory_limit
+
+    def recycle(self) -> None:
+        # mmacieje: Jobs are recorded in the ledger as they finish, so
+        # relaunching with `-Resume` continues right after this one; the file
+        # written here tells the supervisor to do so, and what is left.
+        remaining_jobs: List[int] = sorted(set(self.job_origins[job_idx] for job_idx in self.job_order[self.job_idx + 1:]))
+        os.makedirs(os.path.dirname(self.recycle_path), exist_ok=True)
+        with open(self.recycle_path + ".tmp", "w") as recycle_file:
+            json.dump({"ledger": self.resume_ledger_path, "remaining_jobs": remaining_jobs, "rss": telemetry.process_rss()}, recycle_file)
+        os.replace(self.recycle_path + ".tmp", self.recycle_path)
+
+        unreal.log_warning(f"Memory watchdog: quitting with {len(remaining_jobs)} job(s) left ({remaining_jobs}), see '{self.recycle_path}'.")
+        self.pie_executor_that_truly_executes = None
+        self.on_executor_finished_impl()
+
+    @unreal.ufunction(ret=None, params=[str])
+    def on_socket_message_received(self, message: str) -> None:
+        # NOTE(mmacieje): Messages are JSON objects. A job carries the same
+        # fields `execute_delayed` reads from the command line, switches being
+        # `true`, e.g.:
+        #
+        #     {"command": "render", "id": "shot_010", "job": {"Sequence": "/Game/Shots/Shot_010.Shot_010", "Width": 2560, "Height": 1440, "Multilayer": true}}
+        #     {"command": "status"}
+        #     {"command": "quit"}
+        #
+        try:
+            request: Dict[str, Any] = json.loads(message)
+        except ValueError:
+            unreal.log_warning(f"Ignoring malformed dispatcher message: '{message}'.")
+            return
+
+        command: str = str(request.get("command", ""))
+        match command:
+            case "render":
+                job_id: str = str(request.get("id", ""))
+                job: Any = request.get("job")
+                if not isinstance(job, dict) or not has_workload(job):
+                    self.send_socket_message(json.dumps({"id": job_id, "status": "rejected", "message": "a job needs one of `Sequence`, `Configuration`, `Queue` or `Manifest`"}))
+                    return
+                self.daemon_backlog.append(json.dumps({"id": job_id, "job": job}))
+                self.send_socket_message(json.dumps({"id": job_id, "status": "accepted", "backlog": len(self.daemon_backlog)}))
+                if not self.is_rendering():
+                    self.start_next_daemon_job()
+
+            case "status":
+                self.report_status("busy" if self.is_rendering() else "idle")
+
+            case "quit":
+                self.daemon_quit_requested = True
+                if not self.is_rendering():
+                    self.start_next_daemon_job()
+
+            case _:
+                unreal.log_warning(f"Ignoring unknown dispatcher command: '{command}'.")
+
+    def start_next_daemon_job(self) -> None:
+        # mmacieje: A pending quit wins over whatever is left in the backlog.
+        if self.daemon_quit_requested:
+            self.report_status("quitting")
+            self.disconnect_socket()
+            # mmacieje: Jobs never wait for post-processing in daemon mode,
+            # so the last one may still be at it.
+            self.report_output_pipelines(wait=True)
+            self.on_executor_finished_impl()
+            return
+
+        while len(self.daemon_backlog) > 0:
+            entry: Dict[str, Any] = json.loads(self.daemon_backlog.pop(0))
+            self.daemon_job_id = entry["id"]
+
+            cmdln_switches, cmdln_args = job_to_command_line(entry["job"])
+
+            try:
+                workload_good = self.construct_queue(cmdln_switches, cmdln_args)
+            except Exception as exception:
+                unreal.log_error(f"Could not construct job '{self.daemon_job_id}': {exception}")
+                workload_good = False
+
+            if workload_good:
+                self.report_status("started")
+                self.start_job_by_index(0)
+                return
+
+            # mmacieje: A job whose every frame is already there has not
+            # failed; it is simply done.
+            self.report_status("finished" if self.nothing_left_to_render else "errored")
+
+        self.daemon_job_id = ""
+        self.report_status("idle")
+
+    def report_output_pipelines(self, wait: bool) -> None:
+        for output_pipeline in list(output_pipelines):
+            if not wait and not output_pipeline.done():
+                continue
+            report = output_pipeline.wait()
+            output_pipelines.remove(output_pipeline)
+
+            log_callable = unreal.log if report["within_grace"] and not report["failures"] else unreal.log_warning
+            log_callable(f"Post-processing of {report['frames']} frame(s) in '{report['output_directory']}' finished {report['lag']:.1f}s after the render ended ({'within' if report['within_grace'] else 'beyond'} the {output_pipeline.grace:.1f}s grace), {len(report['failures'])} failure(s).")
+            for failure in report["failures"]:
+                unreal.log_warning(failure)
+
+    def report_status(self, status: str) -> None:
+        self.send_socket_message(json.dumps({"id": self.daemon_job_id, "status": status, "job_idx": self.original_job_idx() if self.job_idx != -1 else -1, "backlog": len(self.daemon_backlog)}))
+
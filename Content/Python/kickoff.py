@@ -1,6 +1,7 @@
 from typing import Optional, Callable
 from host_executor import HostExecutor
 
+import timeline
 import unreal
 
 # NOTE(mmacieje): In an embedded environment like Unreal Engine’s Python
@@ -38,40 +39,49 @@ def on_executor_finished(_executor: unreal.MoviePipelineExecutorBase, _success:
 
 
 def wait_for_asset_registry(_delta: float):
-    if unreal.AssetRegistryHelpers.get_asset_registry().is_loading_assets() == False:
-        global tick
-
-        # mmacieje: (a) Unregister _the_ callback
-        unreal.unregister_slate_pre_tick_callback(tick)
-
-        global executor
-
-        # mmacieje: Instantiate _the_ Executor
-        #
-        # This dummy executor is designed to host an executor implemented in
-        # Python. Python-defined `UClass`es are not available when the executor
-        # is initialised, and not all callbacks are accessible from Python. By
-        # subclassing this class in Python and specifying the `UClass` to spawn
-        # latently, certain events can be forwarded to Python by overriding the
-        # appropriate functions.
-        #
-        # Fair choice.
-        executor = HostExecutor()
-
-        # mmacieje: Set up its properties.
-        executor.target_pipeline_class = unreal.MoviePipeline
-        executor.user_data = "If you truly wished, you could paste a JSON file here"
-
-        # mmacieje: Set up its callbacks. Here, we configure all callbacks so that the sample
-        # is exhaustive, although some implementations are dummy.
-        executor.on_executor_errored_delegate.add_callable_unique(on_movie_pipeline_executor_errored)
-        executor.on_executor_finished_delegate.add_callable_unique(on_executor_finished)
-
-        # mmacieje: (b) Kick off the jobs
-        subsystem = unreal.get_editor_subsystem(unreal.MoviePipelineQueueSubsystem)
-        subsystem.render_queue_with_executor_instance(executor)
-    else:
-        unreal.log_warning("Asset Registry subsystem is still indexing assets...")
+    global tick
+
+    # mmacieje: (a) Unregister _the_ callback; this is the one and only tick
+    # we need.
+    unreal.unregister_slate_pre_tick_callback(tick)
+
+    # mmacieje: Asset Registry's "files loaded" notification is not exposed to
+    # Python, but `wait_for_completion` is the next best thing: it returns as
+    # soon as the background gather is done, rather than us polling
+    # `is_loading_assets()` (and complaining about it) once per tick.
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    if asset_registry.is_loading_assets():
+        unreal.log("Asset Registry subsystem is still indexing assets; waiting for it to finish...")
+        asset_registry.wait_for_completion()
+    timeline.mark(timeline.REGISTRY_READY)
+
+    global executor
+
+    # mmacieje: Instantiate _the_ Executor
+    #
+    # This dummy executor is designed to host an executor implemented in
+    # Python. Python-defined `UClass`es are not available when the executor
+    # is initialised, and not all callbacks are accessible from Python. By
+    # subclassing this class in Python and specifying the `UClass` to spawn
+    # latently, certain events can be forwarded to Python by overriding the
+    # appropriate functions.
+    #
+    # Fair choice.
+    executor = HostExecutor()
+    timeline.mark(timeline.EXECUTOR_CREATED)
+
+    # mmacieje: Set up its properties.
+    executor.target_pipeline_class = unreal.MoviePipeline
+    executor.user_data = "If you truly wished, you could paste a JSON file here"
+
+    # mmacieje: Set up its callbacks. Here, we configure all callbacks so that the sample
+    # is exhaustive, although some implementations are dummy.
+    executor.on_executor_errored_delegate.add_callable_unique(on_movie_pipeline_executor_errored)
+    executor.on_executor_finished_delegate.add_callable_unique(on_executor_finished)
+
+    # mmacieje: (b) Kick off the jobs
+    subsystem = unreal.get_editor_subsystem(unreal.MoviePipelineQueueSubsystem)
+    subsystem.render_queue_with_executor_instance(executor)
 
 
 def entry_point():
@@ -79,9 +89,10 @@ def entry_point():
     # called. Therefore, we should wait until it has finished indexing (or parsing?)
     # all assets in the project before proceeding, as any attempts to look up the
     # assets may fail unexpectedly. This registers a per‐tick callback that is
-    # invoked once per frame. Once Asset Registry reports that it is fully loaded,
-    # we will (a) unregister this callback and (b) initiate Movie Pipeline jobs.
-    # This ensures that rendering is started only once.
+    # invoked on the next frame, once the editor is up. There, we (a) unregister
+    # this callback, wait for Asset Registry to report that it is fully loaded,
+    # and (b) initiate Movie Pipeline jobs. This ensures that rendering is
+    # started only once.
     global tick
     tick = unreal.register_slate_pre_tick_callback(wait_for_asset_registry)
 
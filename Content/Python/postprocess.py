@@ -0,0 +1,239 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import string
+import subprocess
+import sys
+import threading
+import time
+
+# NOTE(mmacieje): An opt-in stage that post-processes frames while the job is
+# still rendering them, instead of a separate script running once everything
+# is done. A background thread watches the job's output directory; once a
+# frame has stopped growing, the configured chain of steps is run on it by a
+# bounded pool of low-priority child processes. Nothing here touches `unreal`
+# or runs on the game thread, and the watcher simply stops picking up new
+# frames while the pool is saturated, so the renderer is never kept waiting.
+#
+# Steps are configured with a JSON file, e.g.:
+#
+#     {
+#         "workers": 2,
+#         "grace": 5.0,
+#         "steps": [
+#             {"name": "proxy", "command": ["oiiotool", "{path}", "--resize", "25%", "-o", "{render_pass_dir}/proxy/{stem}.jpg"]},
+#             {"name": "checksum"}
+#         ],
+#         "final_steps": [
+#             {"name": "package", "command": ["tar", "-cf", "{render_pass_dir}.tar", "-C", "{render_pass_dir}", "."]}
+#         ]
+#     }
+#
+# `steps` run on every frame, in order; `final_steps` run once per render pass
+# directory after the last frame. Commands may use `{path}`, `{stem}`,
+# `{render_pass}`, `{render_pass_dir}` and `{output_dir}`; anything else, or
+# a lone brace (write `{{` and `}}` for literal ones), makes `load_config`
+# reject the configuration. The only built-in step is `checksum`, which
+# writes `<frame>.sha256` next to the frame.
+
+FRAME_EXTENSIONS: Tuple[str, ...] = (".exr", ".png", ".jpg", ".jpeg", ".bmp")
+
+POLL_INTERVAL: float = 0.5
+
+CHECKSUM: str = "checksum"
+
+PLACEHOLDERS: Tuple[str, ...] = ("path", "stem", "render_pass", "render_pass_dir", "output_dir")
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    with open(path) as config_file:
+        config = json.load(config_file)
+    for step in config.get("steps", []) + config.get("final_steps", []):
+        if step.get("name") != CHECKSUM and not step.get("command"):
+            raise ValueError(f"Step '{step.get('name')}' has no `command`")
+        # mmacieje: An unknown placeholder, or a lone brace, would otherwise
+        # only blow up on the first frame, on a thread nobody looks at.
+        for arg in step.get("command") or []:
+            try:
+                field_names = [field_name for _literal_text, field_name, _format_spec, _conversion in string.Formatter().parse(str(arg)) if field_name is not None]
+            except ValueError as exception:
+                raise ValueError(f"Step '{step.get('name')}' has a malformed argument '{arg}': {exception}")
+            for field_name in field_names:
+                if field_name not in PLACEHOLDERS:
+                    raise ValueError(f"Step '{step.get('name')}' uses `{{{field_name}}}`, which is none of {', '.join(f'`{{{name}}}`' for name in PLACEHOLDERS)}; double braces stand for literal ones")
+    return config
+
+
+def run_step(step: Dict[str, Any], arguments: Dict[str, str]) -> None:
+    if step.get("name") == CHECKSUM and not step.get("command"):
+        digest = hashlib.sha256()
+        with open(arguments["path"], "rb") as frame_file:
+            for chunk in iter(lambda: frame_file.read(1 << 20), b""):
+                digest.update(chunk)
+        with open(arguments["path"] + ".sha256", "w") as checksum_file:
+            checksum_file.write(f"{digest.hexdigest()}  {os.path.basename(arguments['path'])}\n")
+        return
+
+    # mmacieje: Below normal priority, so that the renderer always wins.
+    command = [str(arg).format(**arguments) for arg in step["command"]]
+    if sys.platform == "win32":
+        subprocess.run(command, check=True, capture_output=True, creationflags=subprocess.BELOW_NORMAL_PRIORITY_CLASS)
+        return
+
+    # mmacieje: Not `preexec_fn`, which runs Python in a child forked off
+    # the multithreaded editor and may deadlock; the child is reniced once it
+    # is running instead.
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        os.setpriority(os.PRIO_PROCESS, process.pid, 10)
+    except OSError:
+        pass  # mmacieje: Done already
+    stdout, stderr = process.communicate()
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+
+
+class OutputPipeline:
+    def __init__(self, output_directory: str, config: Dict[str, Any], adopted_paths: Iterable[str] = ()) -> None:
+        self.output_directory: str = output_directory
+        # mmacieje: Frames that are ours whatever their age, e.g. those the
+        # frame cache put in place before the pipeline started.
+        self.adopted_paths: Set[str] = set(adopted_paths)
+        self.steps: List[Dict[str, Any]] = config.get("steps", [])
+        self.final_steps: List[Dict[str, Any]] = config.get("final_steps", [])
+        self.worker_count: int = max(1, int(config.get("workers", max(1, (os.cpu_count() or 1) // 4))))
+        self.grace: float = float(config.get("grace", 5.0))
+
+        self.pool = ThreadPoolExecutor(max_workers=self.worker_count)
+        self.in_flight: List[Future] = []
+        self.seen: Set[str] = set()
+        self.sizes: Dict[str, int] = {}
+        self.render_pass_dirs: Set[str] = set()
+        self.failures: List[str] = []
+        self.frame_count: int = 0
+        self.last_finished_at: float = 0.0
+        self.lock = threading.Lock()
+
+        self.started_at: float = time.time()
+        self.render_ended_at: float = 0.0
+        self.stopping = threading.Event()
+        self.report: Optional[Dict[str, Any]] = None
+
+        self.watcher = threading.Thread(target=self.watch, name="OutputPipelineWatcher", daemon=True)
+        self.watcher.start()
+
+    def landed_frames(self, render_ended: bool) -> List[Tuple[str, str]]:
+        # mmacieje: Frames live right below their `{render_pass}` directory;
+        # anything deeper was most likely written by a step. A frame has
+        # landed once its size stops changing between two polls, or once the
+        # render has ended, as Movie Pipeline flushes its outputs before it
+        # reports a job finished.
+        landed: List[Tuple[str, str]] = []
+        if not os.path.isdir(self.output_directory):
+            return landed
+
+        for render_pass in os.listdir(self.output_directory):
+            render_pass_dir = os.path.join(self.output_directory, render_pass)
+            if not os.path.isdir(render_pass_dir):
+                continue
+            for file_name in os.listdir(render_pass_dir):
+                path = os.path.join(render_pass_dir, file_name)
+                stem, extension = os.path.splitext(file_name)
+                if path in self.seen or not stem.isdigit() or extension.lower() not in FRAME_EXTENSIONS:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # mmacieje: Leftovers of a previous run are not ours.
+                if stat.st_mtime < self.started_at and path not in self.adopted_paths:
+                    self.seen.add(path)
+                    continue
+                if render_ended or (stat.st_size > 0 and self.sizes.get(path) == stat.st_size):
+                    landed.append((render_pass, path))
+                self.sizes[path] = stat.st_size
+        return landed
+
+    def watch(self) -> None:
+        # mmacieje: Whatever happens, `wait` gets a report.
+        try:
+            self.scan()
+        except Exception as exception:
+            with self.lock:
+                self.failures.append(f"watcher on '{self.output_directory}': {exception}")
+        finally:
+            self.pool.shutdown(wait=True)
+            self.write_report()
+
+    def scan(self) -> None:
+        while True:
+            stopping = self.stopping.is_set()
+            self.in_flight = [future for future in self.in_flight if not future.done()]
+
+            # mmacieje: Backpressure: never queue more than the pool can chew
+            # on right now; the rest waits for the next poll.
+            for render_pass, path in self.landed_frames(stopping):
+                if len(self.in_flight) >= self.worker_count and not stopping:
+                    break
+                self.seen.add(path)
+                self.sizes.pop(path, None)
+                self.render_pass_dirs.add(os.path.dirname(path))
+                self.in_flight.append(self.pool.submit(self.process_frame, render_pass, path))
+
+            # mmacieje: The scan after the render has ended is the last one.
+            if stopping:
+                break
+            time.sleep(POLL_INTERVAL)
+
+        self.pool.shutdown(wait=True)
+        for render_pass_dir in sorted(self.render_pass_dirs):
+            self.run_steps(self.final_steps, {"path": render_pass_dir, "stem": "", "render_pass": os.path.basename(render_pass_dir), "render_pass_dir": render_pass_dir, "output_dir": self.output_directory})
+
+    def write_report(self) -> None:
+        lag = max(self.last_finished_at, self.render_ended_at) - self.render_ended_at
+        report = {
+            "output_directory": self.output_directory,
+            "frames": self.frame_count,
+            "failures": self.failures,
+            "lag": lag,
+            "within_grace": lag <= self.grace,
+        }
+        try:
+            os.makedirs(self.output_directory, exist_ok=True)
+            with open(os.path.join(self.output_directory, "postprocess_report.json"), "w") as report_file:
+                json.dump(report, report_file, indent=4)
+        except OSError as exception:
+            report["failures"].append(f"report of '{self.output_directory}': {exception}")
+        self.report = report
+
+    def process_frame(self, render_pass: str, path: str) -> None:
+        self.run_steps(self.steps, {"path": path, "stem": os.path.splitext(os.path.basename(path))[0], "render_pass": render_pass, "render_pass_dir": os.path.dirname(path), "output_dir": self.output_directory})
+        with self.lock:
+            self.frame_count += 1
+
+    def run_steps(self, steps: List[Dict[str, Any]], arguments: Dict[str, str]) -> None:
+        for step in steps:
+            try:
+                run_step(step, arguments)
+            except Exception as exception:
+                # mmacieje: Anything, as an exception escaping here vanishes
+                # into a `Future` nobody looks at.
+                with self.lock:
+                    self.failures.append(f"{step.get('name')} on '{arguments['path']}': {exception}")
+                break
+        with self.lock:
+            self.last_finished_at = time.time()
+
+    def finish(self) -> None:
+        # mmacieje: Returns immediately; see `done` and `report`.
+        self.render_ended_at = time.time()
+        self.stopping.set()
+
+    def done(self) -> bool:
+        return self.report is not None
+
+    def wait(self) -> Dict[str, Any]:
+        self.watcher.join()
+        return self.report
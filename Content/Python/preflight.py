@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Tuple
+import unreal
+
+# NOTE(mmacieje): Everything a workload refers to, i.e. maps, Sequences,
+# configurations, queues and materials, is looked up in the asset registry,
+# which knows every asset on disk without loading any, before a single job is
+# built; a bad reference is then reported along with all the others within
+# seconds, rather than minutes into a render, or never.
+#
+# Python has no way of loading assets asynchronously (the latent
+# `load_asset` node and `FStreamableManager` are not exposed to it), so the
+# opt-in `prefetch` loads what the remaining jobs need up front,
+# synchronously, and keeps it referenced from `prefetched_assets` so that it
+# survives the garbage collection of map loads between jobs. Nothing overlaps
+# with rendering; loading merely moves to the start of the workload, and
+# `retain` lets go of whatever the jobs left no longer need, as it counts
+# towards `-MemoryLimit`. Maps are left alone, as loading one replaces the
+# editor world.
+
+MAP_CLASS_NAMES: Tuple[str, ...] = ("World",)
+SEQUENCE_CLASS_NAMES: Tuple[str, ...] = ("LevelSequence",)
+CONFIGURATION_CLASS_NAMES: Tuple[str, ...] = ("MoviePipelinePrimaryConfig", "MoviePipelineMasterConfig")
+QUEUE_CLASS_NAMES: Tuple[str, ...] = ("MoviePipelineQueue",)
+MATERIAL_CLASS_NAMES: Tuple[str, ...] = ("Material", "MaterialInstanceConstant")
+
+prefetched_assets: Dict[str, unreal.Object] = {}
+
+
+def asset_class_name(asset_data: unreal.AssetData) -> str:
+    # mmacieje: `asset_class` was deprecated in favour of `asset_class_path`
+    # in 5.1.
+    asset_class_path = getattr(asset_data, "asset_class_path", None)
+    return str(asset_class_path.asset_name) if asset_class_path else str(asset_data.asset_class)
+
+
+def find_asset(asset_ref: str) -> Optional[unreal.AssetData]:
+    # mmacieje: Both `/Game/Maps/Street` and `/Game/Maps/Street.Street` name
+    # the very same asset.
+    package_name, _separator, asset_name = asset_ref.partition(".")
+    asset_name = asset_name or package_name.rsplit("/", 1)[-1]
+    asset_registry = unreal.AssetRegistryHelpers.get_asset_registry()
+    for asset_data in asset_registry.get_assets_by_package_name(package_name) or []:
+        if str(asset_data.asset_name) == asset_name:
+            return asset_data
+    return None
+
+
+def check_asset(kind: str, asset_ref: str, class_names: Tuple[str, ...]) -> List[str]:
+    if not asset_ref:
+        return [f"no {kind} given"]
+    asset_data = find_asset(asset_ref)
+    if not asset_data:
+        return [f"{kind} '{asset_ref}' does not exist"]
+    class_name = asset_class_name(asset_data)
+    if class_name not in class_names:
+        return [f"{kind} '{asset_ref}' is of class {class_name}, not {' or '.join(class_names)}"]
+    return []
+
+
+def check_map(map_ref: str, current_map_ref: str) -> List[str]:
+    # mmacieje: The map the editor has open may well be unsaved, and thus
+    # unknown to the registry, but is there all the same.
+    if map_ref.split(".", 1)[0] == current_map_ref:
+        return []
+    return check_asset("map", map_ref, MAP_CLASS_NAMES)
+
+
+def check_job(map_ref: str, sequence_ref: str, material_refs: List[str], current_map_ref: str) -> List[str]:
+    problems: List[str] = check_map(map_ref, current_map_ref)
+    problems += check_asset("Sequence", sequence_ref, SEQUENCE_CLASS_NAMES)
+    for material_ref in material_refs:
+        problems += check_asset("material", material_ref, MATERIAL_CLASS_NAMES)
+    return problems
+
+
+def check_configuration(configuration: unreal.MoviePipelinePrimaryConfig) -> List[str]:
+    # mmacieje: Configurations refer to their post-process materials softly,
+    # so a deleted or moved one only shows up as nothing at all.
+    problems: List[str] = []
+    for deferred_pass in configuration.find_settings_by_class(unreal.MoviePipelineDeferredPassBase, False, False):
+        for post_process_pass in deferred_pass.additional_post_process_materials:
+            if post_process_pass.enabled and not post_process_pass.material:
+                problems.append(f"a post-process material of '{deferred_pass.get_name()}' does not exist")
+    return problems
+
+
+def prefetch(asset_refs: List[str]) -> List[str]:
+    problems: List[str] = []
+    for asset_ref in dict.fromkeys(asset_refs):
+        if asset_ref in prefetched_assets:
+            continue
+        asset = unreal.EditorAssetLibrary.load_asset(asset_ref)
+        if asset:
+            prefetched_assets[asset_ref] = asset
+        else:
+            problems.append(f"'{asset_ref}' could not be loaded")
+    return problems
+
+
+def retain(asset_refs: List[str]) -> None:
+    for asset_ref in set(prefetched_assets) - set(asset_refs):
+        del prefetched_assets[asset_ref]
+
+
+def release() -> None:
+    prefetched_assets.clear()
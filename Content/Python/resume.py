@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Optional, Set
+import hashlib
+import json
+import os
+import time
+import unreal
+
+from frames import Span
+
+# NOTE(mmacieje): Everything `HostExecutor` needs to pick a workload up where a
+# crashed editor left it. Finished jobs are recorded in a small JSON ledger
+# (`{project_dir}/Saved/MovieRenders/Resume/<key>.json`) as soon as they
+# finish; frames of the job that was interrupted are recovered from its output
+# directory instead, since that is the only place that knows what actually
+# made it to disk. Only frames written since the run started count, as the
+# very same directories may well hold frames of an earlier run of the same
+# workload; the ledger remembers when that was.
+
+# mmacieje: Command-line arguments that make up a workload. Anything else, e.g.
+# `-Telemetry`, changes how a workload is rendered, not what is rendered.
+JOB_PARAMETER_NAMES = (
+    "Map",
+    "Manifest",
+    "Queue",
+    "Configuration",
+    "Sequence",
+    "Width",
+    "Height",
+    "StartFrame",
+    "EndFrame",
+    "FrameRate",
+    "TemporalSampleCount",
+    "SpatialSampleCount",
+    "DeferredPass",
+    "Materials",
+    "Multilayer",
+    "EngineWarmUpCount",
+    "RenderWarmUpCount",
+    "ConsoleVariables",
+    "Preview",
+    "PreviewStride",
+    "PreviewScale",
+    "CVarProfile",
+    "CVarProfiles",
+)
+
+
+def workload_key(cmdln_switches: List[str], cmdln_args: Dict[str, Any], map_ref: str) -> str:
+    parameters: Dict[str, str] = {"Map": map_ref}
+    for name in JOB_PARAMETER_NAMES:
+        if name in cmdln_args:
+            parameters[name] = json.dumps(cmdln_args[name], sort_keys=True)
+        elif name in cmdln_switches:
+            parameters[name] = "True"
+
+    # mmacieje: A manifest is the workload, not its path.
+    if "Manifest" in cmdln_args:
+        try:
+            with open(str(cmdln_args["Manifest"]), "rb") as manifest_file:
+                parameters["Manifest"] = hashlib.sha1(manifest_file.read()).hexdigest()
+        except OSError:
+            pass
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def ledger_path(key: str) -> str:
+    return os.path.join(unreal.Paths.project_saved_dir(), "MovieRenders", "Resume", f"{key}.json")
+
+
+def load_ledger(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as ledger_file:
+            return json.load(ledger_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_finished_jobs(path: str) -> Set[int]:
+    return set(load_ledger(path).get("finished_jobs", []))
+
+
+def run_started_at(path: str) -> float:
+    # mmacieje: 0.0 if unknown, e.g. a ledger of an older executor.
+    return float(load_ledger(path).get("started_at", 0.0))
+
+
+def save_ledger(path: str, finished_jobs: Set[int], started_at: float) -> None:
+    # mmacieje: Write-then-rename, so that a crash never leaves half a ledger.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as ledger_file:
+        json.dump({"started_at": started_at, "finished_jobs": sorted(finished_jobs)}, ledger_file)
+    os.replace(path + ".tmp", path)
+
+
+def start_run(path: str) -> None:
+    save_ledger(path, set(), time.time())
+
+
+def mark_job_finished(path: str, job_idx: int) -> None:
+    ledger = load_ledger(path)
+    save_ledger(path, set(ledger.get("finished_jobs", [])) | {job_idx}, float(ledger.get("started_at", 0.0)))
+
+
+def output_setting_of(job: unreal.MoviePipelineExecutorJob) -> unreal.MoviePipelineOutputSetting:
+    return job.get_configuration().find_or_add_setting_by_class(unreal.MoviePipelineOutputSetting)
+
+
+def resolve_output_directory(job: unreal.MoviePipelineExecutorJob) -> str:
+    output_directory: str = output_setting_of(job).output_directory.path
+    output_directory = output_directory.replace("{project_dir}", unreal.Paths.convert_relative_path_to_full(unreal.Paths.project_dir()))
+
+    params = unreal.MoviePipelineFilenameResolveParams()
+    params.job = job
+    resolved_directory, _format_args = unreal.MoviePipelineLibrary.resolve_filename_format_arguments(output_directory, params)
+    return resolved_directory
+
+
+def job_frame_range(job: unreal.MoviePipelineExecutorJob) -> Optional[Span]:
+    output_setting = output_setting_of(job)
+    # mmacieje: A strided job never has all of its frames on disk.
+    if (output_setting.output_frame_step or 1) > 1:
+        return None
+    if output_setting.use_custom_playback_range:
+        return (output_setting.custom_start_frame, output_setting.custom_end_frame)
+
+    sequence = unreal.load_asset(job.sequence.export_text())
+    if not sequence:
+        return None
+
+    # mmacieje: File names carry frame numbers in the output frame rate, while
+    # the playback range is in the display rate; rather than guess how Movie
+    # Pipeline rounds between them, leave such jobs alone.
+    display_rate = sequence.get_display_rate()
+    if output_setting.use_custom_frame_rate and (output_setting.output_frame_rate.numerator * display_rate.denominator != display_rate.numerator * output_setting.output_frame_rate.denominator):
+        return None
+
+    return (sequence.get_playback_start(), sequence.get_playback_end())
+
+
+def narrow_job(queue: unreal.MoviePipelineQueue, job: unreal.MoviePipelineExecutorJob, spans: List[Span]) -> int:
+    # mmacieje: One sub-range job per span; Movie Pipeline has no notion of
+    # a range with holes in it. Returns how many jobs were added.
+    for span_start, span_end in spans:
+        span_job = queue.duplicate_job(job)
+        output_setting = output_setting_of(span_job)
+        output_setting.use_custom_playback_range = True
+        output_setting.custom_start_frame = span_start
+        output_setting.custom_end_frame = span_end
+    return len(spans)
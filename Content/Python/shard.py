@@ -0,0 +1,207 @@
+from typing import Dict, List, Optional, Tuple
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from frames import collect_frames, format_frames
+
+# NOTE(mmacieje): Unlike the modules `kickoff.py` drives, this one is meant
+# to be run _outside_ of the editor, with a regular Python interpreter.
+# It does not import `unreal`; it merely launches `UnrealEditor-Cmd` workers,
+# each rendering a contiguous slice of the very same Sequence through
+# `kickoff.py`, and then checks that the shared output tree holds every frame
+# exactly once. The only thing it knows about the editor is the command line
+# that `HostExecutor.execute_delayed` parses, so any executable that accepts
+# the same arguments and writes `{render_pass}/{frame_number}.<ext>` files to
+# the output directory will do, which makes it easy to exercise with a fake
+# editor.
+#
+# Bear in mind that `-EndFrame`, just like `custom_end_frame`, is exclusive.
+
+Shard = Tuple[int, int]
+
+POLL_INTERVAL: float = 0.5
+
+
+def cut_into_shards(start_frame: int, end_frame: int, worker_count: int, min_shard_length: int) -> List[Shard]:
+    frame_count: int = end_frame - start_frame
+    if frame_count <= 0:
+        raise ValueError(f"Empty frame range: [{start_frame}, {end_frame})")
+
+    # mmacieje: Each worker pays the full warm-up before its first frame, so
+    # a shard shorter than `min_shard_length` spends more time warming up than
+    # rendering; use fewer, longer shards instead.
+    shard_count: int = max(1, min(worker_count, frame_count // max(1, min_shard_length)))
+    shard_length, remainder = divmod(frame_count, shard_count)
+
+    shards: List[Shard] = []
+    shard_start: int = start_frame
+    for shard_idx in range(shard_count):
+        shard_end = shard_start + shard_length + (1 if shard_idx < remainder else 0)
+        shards.append((shard_start, shard_end))
+        shard_start = shard_end
+    return shards
+
+
+def default_output_directory(project: str, sequence_ref: str, width: int, height: int, temporal_sample_count: int, spatial_sample_count: int, frame_rate: int, deferred_pass: str) -> str:
+    # mmacieje: Mirrors `output_setting.output_directory` in `host_executor.py`,
+    # where `/Game/Shots/Shot.Shot` makes `Shot` and
+    # `Base:PostProcessInput2,LightingOnly` makes `base+lightingonly`.
+    project_dir = os.path.dirname(os.path.abspath(project))
+    sequence_name = sequence_ref.split(".", 1)[0].rsplit("/", 1)[-1]
+    pass_names = "+".join(item.split(":", 1)[0].strip().lower() for item in deferred_pass.split(",") if item.strip())
+    return os.path.join(project_dir, "Saved", "MovieRenders", sequence_name, f"{width}x{height}_{temporal_sample_count}_{spatial_sample_count}_{frame_rate}_{pass_names}")
+
+
+def verify_frames(output_directory: str, start_frame: int, end_frame: int) -> List[str]:
+    problems: List[str] = []
+    frames_per_pass = collect_frames(output_directory)
+    if not frames_per_pass:
+        return [f"No frames found in '{output_directory}'"]
+
+    expected = set(range(start_frame, end_frame))
+    for render_pass, frames in sorted(frames_per_pass.items()):
+        missing = sorted(expected - set(frames))
+        duplicated = sorted(frame for frame, count in frames.items() if count > 1)
+        if missing:
+            problems.append(f"'{render_pass}' is missing {len(missing)} frame(s): {format_frames(missing)}")
+        if duplicated:
+            problems.append(f"'{render_pass}' has {len(duplicated)} duplicated frame(s): {format_frames(duplicated)}")
+    return problems
+
+
+def shard_rendered(output_directory: str, shard: Shard, launched_at: float) -> bool:
+    # mmacieje: The editor's exit code says little (see `on_executor_finished`
+    # in `kickoff.py`), so a shard counts as rendered only if every render
+    # pass gained all of its frames after the worker was launched.
+    frames_per_pass = collect_frames(output_directory, newer_than=launched_at)
+    if not frames_per_pass:
+        return False
+    expected = set(range(*shard))
+    return all(expected <= set(frames) for frames in frames_per_pass.values())
+
+
+def build_command(editor: str, project: str, map_ref: str, sequence_ref: str, shard: Shard, extra_args: List[str]) -> List[str]:
+    command: List[str] = [editor]
+    if map_ref:
+        command.append(map_ref)
+    command += [
+        os.path.abspath(project),
+        '-ExecCmds="py kickoff.py"',
+        f"-Sequence={sequence_ref}",
+        f"-StartFrame={shard[0]}",
+        f"-EndFrame={shard[1]}",
+    ]
+    command += extra_args
+    return command
+
+
+def launch(command: List[str], log_path: Optional[str]) -> subprocess.Popen:
+    # mmacieje: `-ExecCmds="py kickoff.py"` must reach the editor verbatim,
+    # which `subprocess.list2cmdline` would not allow on Windows.
+    args = " ".join(arg if '"' in arg or " " not in arg else f'"{arg}"' for arg in command) if sys.platform == "win32" else command
+    if not log_path:
+        return subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    # mmacieje: The child keeps a handle of its own.
+    with open(log_path, "w") as log_file:
+        return subprocess.Popen(args, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def run_shards(editor: str, project: str, map_ref: str, sequence_ref: str, shards: List[Shard], worker_count: int, retry_count: int, output_directory: str, extra_args: List[str], log_directory: str) -> List[Shard]:
+    pending: List[Shard] = list(shards)
+    attempts: Dict[Shard, int] = {shard: 0 for shard in shards}
+    running: Dict[Shard, Tuple[subprocess.Popen, float]] = {}
+    failed: List[Shard] = []
+
+    while pending or running:
+        # mmacieje: Fill all idle worker slots
+        while pending and len(running) < worker_count:
+            shard = pending.pop(0)
+            attempts[shard] += 1
+            log_path = os.path.join(log_directory, f"shard_{shard[0]}_{shard[1]}_{attempts[shard]}.log") if log_directory else None
+            command = build_command(editor, project, map_ref, sequence_ref, shard, extra_args)
+            print(f"[shard {shard[0]}-{shard[1]}] attempt {attempts[shard]}: launching")
+            running[shard] = (launch(command, log_path), time.time())
+
+        time.sleep(POLL_INTERVAL)
+
+        for shard, (process, launched_at) in list(running.items()):
+            exit_code = process.poll()
+            if exit_code is None:
+                continue
+            del running[shard]
+
+            if exit_code == 0 and shard_rendered(output_directory, shard, launched_at):
+                print(f"[shard {shard[0]}-{shard[1]}] done in {time.time() - launched_at:.1f}s")
+            elif attempts[shard] <= retry_count:
+                print(f"[shard {shard[0]}-{shard[1]}] failed (exit code {exit_code}); retrying")
+                pending.append(shard)
+            else:
+                print(f"[shard {shard[0]}-{shard[1]}] failed (exit code {exit_code}); giving up")
+                failed.append(shard)
+
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render one Sequence across several parallel editor processes.")
+    parser.add_argument("--editor", required=True, help="path to `UnrealEditor-Cmd` (or anything that behaves like it)")
+    parser.add_argument("--project", required=True, help="path to the `.uproject` file")
+    parser.add_argument("--map", default="", help="map to open, e.g. /Game/Path/To/Map/Map.Map")
+    parser.add_argument("--sequence", required=True, help="level sequence to render")
+    parser.add_argument("--start-frame", type=int, required=True)
+    parser.add_argument("--end-frame", type=int, required=True, help="exclusive, just like `-EndFrame`")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--retries", type=int, default=2, help="how many times a failed shard is relaunched")
+    parser.add_argument("--min-shard-length", type=int, default=0, help="defaults to the engine warm-up count")
+    parser.add_argument("--engine-warm-up-count", type=int, default=0, help="defaults to the calibrated count (see `warmup.py`), or 101")
+    parser.add_argument("--render-warm-up-count", type=int, default=0, help="defaults to the calibrated count (see `warmup.py`), or 97")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--frame-rate", type=int, default=30)
+    parser.add_argument("--temporal-sample-count", type=int, default=1)
+    parser.add_argument("--spatial-sample-count", type=int, default=1)
+    parser.add_argument("--deferred-pass", default="Base", help="one or more comma-separated passes, just like `-DeferredPass`")
+    parser.add_argument("--output-directory", default="", help="defaults to the directory `HostExecutor` renders into")
+    parser.add_argument("--log-directory", default="", help="where to keep each worker's output")
+    parser.add_argument("extra_args", nargs=argparse.REMAINDER, help="anything after `--` is passed to every worker verbatim")
+    args = parser.parse_args(argv)
+
+    extra_args: List[str] = [arg for arg in args.extra_args if arg != "--"]
+    extra_args += [
+        f"-Width={args.width}",
+        f"-Height={args.height}",
+        f"-FrameRate={args.frame_rate}",
+        f"-TemporalSampleCount={args.temporal_sample_count}",
+        f"-SpatialSampleCount={args.spatial_sample_count}",
+        f"-DeferredPass={args.deferred_pass}",
+    ]
+    if args.engine_warm_up_count:
+        extra_args.append(f"-EngineWarmUpCount={args.engine_warm_up_count}")
+    if args.render_warm_up_count:
+        extra_args.append(f"-RenderWarmUpCount={args.render_warm_up_count}")
+
+    output_directory: str = args.output_directory or default_output_directory(args.project, args.sequence, args.width, args.height, args.temporal_sample_count, args.spatial_sample_count, args.frame_rate, args.deferred_pass)
+    if args.log_directory:
+        os.makedirs(args.log_directory, exist_ok=True)
+
+    min_shard_length: int = args.min_shard_length or args.engine_warm_up_count or 101
+    shards = cut_into_shards(args.start_frame, args.end_frame, args.workers, min_shard_length)
+    print(f"Rendering [{args.start_frame}, {args.end_frame}) as {len(shards)} shard(s) into '{output_directory}'")
+
+    started_at = time.time()
+    failed = run_shards(args.editor, args.project, args.map, args.sequence, shards, args.workers, args.retries, output_directory, extra_args, args.log_directory)
+    print(f"All workers exited after {time.time() - started_at:.1f}s")
+
+    problems = verify_frames(output_directory, args.start_frame, args.end_frame)
+    for shard in failed:
+        problems.append(f"Shard [{shard[0]}, {shard[1]}) failed after {args.retries + 1} attempt(s)")
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
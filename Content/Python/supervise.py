@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional
+import argparse
+import json
+import os
+import sys
+import time
+
+from shard import launch
+
+# NOTE(mmacieje): Just like `shard.py`, this one is run _outside_ of the
+# editor. It launches a single `UnrealEditor-Cmd` with whatever workload it is
+# given and, whenever `HostExecutor`'s memory watchdog (`-MemoryLimit`) makes
+# the editor quit halfway through the queue, launches a fresh one with
+# `-Resume`, which picks the queue up right after the last finished job. The
+# executor tells a recycle from the end of the queue by writing
+# `-RecycleFile`; an editor that exits without writing it is either done or
+# has crashed, which is told apart by its exit code.
+#
+# Every relaunch resumes, after a crash as much as after a recycle. That is
+# only safe because the first launch does not: it starts a fresh run in the
+# resume ledger, and `-Resume` trusts only frames written since then, never
+# those an earlier render left in the same output directories.
+
+POLL_INTERVAL: float = 0.5
+
+
+def build_command(editor: str, project: str, map_ref: str, memory_limit: int, recycle_path: str, resuming: bool, extra_args: List[str]) -> List[str]:
+    command: List[str] = [editor]
+    if map_ref:
+        command.append(map_ref)
+    command += [
+        os.path.abspath(project),
+        '-ExecCmds="py kickoff.py"',
+        f"-RecycleFile={recycle_path}",
+    ]
+    if memory_limit:
+        command.append(f"-MemoryLimit={memory_limit}")
+    if resuming:
+        command.append("-Resume")
+    command += extra_args
+    return command
+
+
+def read_recycle_file(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as recycle_file:
+            return json.load(recycle_file)
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render a workload in as many editor processes as it takes to keep memory in check.")
+    parser.add_argument("--editor", required=True, help="path to `UnrealEditor-Cmd` (or anything that behaves like it)")
+    parser.add_argument("--project", required=True, help="path to the `.uproject` file")
+    parser.add_argument("--map", default="", help="map to open, e.g. /Game/Path/To/Map/Map.Map")
+    parser.add_argument("--memory-limit", type=int, default=0, help="in MiB; `-MemoryLimit` of every editor")
+    parser.add_argument("--recycle-file", default="", help="defaults to a file next to the project")
+    parser.add_argument("--max-recycles", type=int, default=100, help="how many times the editor is relaunched to free memory")
+    parser.add_argument("--retries", type=int, default=2, help="how many times a crashed editor is relaunched")
+    parser.add_argument("--log-directory", default="", help="where to keep each editor's output")
+    parser.add_argument("extra_args", nargs=argparse.REMAINDER, help="anything after `--` is passed to every editor verbatim, e.g. `-Manifest=...`")
+    args = parser.parse_args(argv)
+
+    extra_args: List[str] = [arg for arg in args.extra_args if arg != "--"]
+    recycle_path: str = os.path.abspath(args.recycle_file or os.path.join(os.path.dirname(os.path.abspath(args.project)), "Saved", "MovieRenders", "Recycle.json"))
+    if args.log_directory:
+        os.makedirs(args.log_directory, exist_ok=True)
+
+    recycle_count: int = 0
+    crash_count: int = 0
+    launch_count: int = 0
+    started_at = time.time()
+
+    while True:
+        # mmacieje: A leftover of an earlier run would pass for a recycle.
+        if os.path.exists(recycle_path):
+            os.remove(recycle_path)
+
+        launch_count += 1
+        resuming: bool = launch_count > 1 or "-Resume" in extra_args
+        log_path = os.path.join(args.log_directory, f"editor_{launch_count}.log") if args.log_directory else None
+        command = build_command(args.editor, args.project, args.map, args.memory_limit, recycle_path, resuming, [arg for arg in extra_args if arg != "-Resume"])
+        print(f"[editor {launch_count}] launching{' with -Resume' if resuming else ''}")
+        launched_at = time.time()
+        process = launch(command, log_path)
+        while process.poll() is None:
+            time.sleep(POLL_INTERVAL)
+        exit_code: int = process.returncode
+
+        recycle = read_recycle_file(recycle_path)
+        if recycle is not None:
+            recycle_count += 1
+            remaining_jobs = recycle.get("remaining_jobs", [])
+            print(f"[editor {launch_count}] recycled after {time.time() - launched_at:.1f}s at {recycle.get('rss', 0) / (1024 * 1024):.0f} MiB; {len(remaining_jobs)} job(s) left: {remaining_jobs}")
+            if recycle_count > args.max_recycles:
+                print(f"Gave up after {args.max_recycles} recycle(s)", file=sys.stderr)
+                return 1
+            continue
+
+        if exit_code == 0:
+            print(f"[editor {launch_count}] done in {time.time() - launched_at:.1f}s")
+            break
+
+        crash_count += 1
+        if crash_count > args.retries:
+            print(f"[editor {launch_count}] failed (exit code {exit_code}); giving up", file=sys.stderr)
+            return 1
+        print(f"[editor {launch_count}] failed (exit code {exit_code}); retrying")
+
+    print(f"Rendered in {launch_count} editor process(es), {recycle_count} recycle(s), after {time.time() - started_at:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+from typing import Any, Dict, List
+import json
+import os
+import sys
+import time
+
+# NOTE(mmacieje): This module does not import `unreal` on purpose; it is fed
+# by `HostExecutor.on_begin_frame`, which runs once per engine tick, i.e.
+# once per sub-sample, and must therefore stay cheap: records go through a
+# large write buffer and nothing is flushed until the job ends.
+
+WARM_UP: str = "warm-up"
+PRODUCING_FRAMES: str = "producing-frames"
+
+WRITE_BUFFER_SIZE: int = 1 << 20
+
+
+# mmacieje: `process_rss` runs every tick, so whatever it needs is set up
+# once, here.
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    process_handle = kernel32.GetCurrentProcess()
+    memory_counters = PROCESS_MEMORY_COUNTERS()
+    memory_counters.cb = ctypes.sizeof(memory_counters)
+    memory_counters_ref = ctypes.byref(memory_counters)
+else:
+    PAGE_SIZE: int = os.sysconf("SC_PAGE_SIZE")
+
+
+def process_rss() -> int:
+    # mmacieje: Resident set size of this process, in bytes; 0 if unknown.
+    if sys.platform == "win32":
+        if kernel32.K32GetProcessMemoryInfo(process_handle, memory_counters_ref, memory_counters.cb):
+            return int(memory_counters.WorkingSetSize)
+        return 0
+
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        import resource
+
+        # mmacieje: Peak rather than current, but better than nothing.
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss) * (1 if sys.platform == "darwin" else 1024)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class Telemetry:
+    def __init__(self, path: str, job_idx: int) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path: str = path
+        self.job_idx: int = job_idx
+        self.file = open(path, "w", buffering=WRITE_BUFFER_SIZE)
+        self.started_at: float = time.time()
+        self.last_at: float = 0.0
+        self.phase_times: Dict[str, float] = {WARM_UP: 0.0, PRODUCING_FRAMES: 0.0}
+        self.record_count: int = 0
+        self.peak_rss: int = 0
+
+        # mmacieje: Per-frame latency is the time between two consecutive
+        # output frame indices, measured while producing frames only.
+        self.frame_idx: int = -1
+        self.frame_started_at: float = 0.0
+        self.frame_latencies: List[float] = []
+
+    def record(self, phase: str, frame_idx: int, frame_count: int, sub_sample_idx: int, sub_sample_count: int) -> None:
+        now = time.time()
+        if self.last_at:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + (now - self.last_at)
+        self.last_at = now
+
+        if phase == PRODUCING_FRAMES and frame_idx != self.frame_idx:
+            if self.frame_idx != -1:
+                self.frame_latencies.append(now - self.frame_started_at)
+            self.frame_idx = frame_idx
+            self.frame_started_at = now
+
+        rss = process_rss()
+        self.peak_rss = max(self.peak_rss, rss)
+        self.record_count += 1
+
+        self.file.write(json.dumps({
+            "time": now,
+            "phase": phase,
+            "frame_idx": frame_idx,
+            "frame_count": frame_count,
+            "sub_sample_idx": sub_sample_idx,
+            "sub_sample_count": sub_sample_count,
+            "rss": rss,
+        }))
+        self.file.write("\n")
+
+    def close(self) -> Dict[str, Any]:
+        now = time.time()
+        self.file.close()
+
+        # mmacieje: The last frame has no successor to time it against, so it
+        # is counted but left out of the latencies.
+        producing_time = self.phase_times[PRODUCING_FRAMES]
+        frame_count = len(self.frame_latencies) + (1 if self.frame_idx != -1 else 0)
+        summary: Dict[str, Any] = {
+            "job_idx": self.job_idx,
+            "records": self.record_count,
+            "frames": frame_count,
+            "wall_time": now - self.started_at,
+            "warm_up_time": self.phase_times[WARM_UP],
+            "producing_frames_time": producing_time,
+            "frames_per_second": frame_count / producing_time if producing_time > 0 else 0.0,
+            "frame_latency_p50": percentile(self.frame_latencies, 0.50),
+            "frame_latency_p95": percentile(self.frame_latencies, 0.95),
+            "peak_rss": self.peak_rss,
+        }
+
+        with open(os.path.splitext(self.path)[0] + ".summary.json", "w") as summary_file:
+            json.dump(summary, summary_file, indent=4)
+        return summary
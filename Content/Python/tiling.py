@@ -0,0 +1,106 @@
+from typing import Dict, List, Tuple
+import argparse
+import sys
+
+# NOTE(mmacieje): Picks `MoviePipelineHighResSetting.tile_count` and
+# `overlap_ratio` for a job from an estimate of the memory its render targets
+# take per frame, rather than rendering everything in one tile and swapping,
+# or tiling everything and paying for it. Plain Python on purpose, so that the
+# estimate can be tried out, and tested, without the engine:
+#
+#     python tiling.py 15360 8640 --deferred-pass base lightingonly --materials 1 --memory-budget 8000
+#
+# The estimate is rough by design. Render targets (scene textures, G-buffer,
+# post-processing chain) scale with the size of a tile; Movie Pipeline's
+# sample accumulators and the images handed to the output writers are always
+# full-resolution, whatever the tiling.
+
+MIB: int = 1024 * 1024
+
+# mmacieje: Bytes per pixel of a tile's render targets, per deferred pass
+RENDER_TARGET_BYTES_PER_PIXEL: Dict[str, int] = {
+    "base": 64,
+    "unlit": 48,
+    "detaillighting": 64,
+    "lightingonly": 64,
+    "reflectionsonly": 64,
+    "pathtracer": 112,
+    "objectid": 80,
+}
+
+# mmacieje: Each post-process material renders into, and is read back from,
+# a full-float target of its own.
+MATERIAL_BYTES_PER_PIXEL: int = 16
+
+# mmacieje: Four float channels and a weight, per layer, once there is more
+# than one sample to accumulate.
+ACCUMULATOR_BYTES_PER_PIXEL: int = 20
+
+# mmacieje: Half-float RGBA, per layer; multilayer EXRs hold every layer, and
+# a copy of it, until the whole file is written.
+OUTPUT_BYTES_PER_PIXEL: int = 8
+
+# mmacieje: Enough to hide the seams screen-space effects leave at tile edges
+OVERLAP_RATIO: float = 0.1
+
+MAX_TILE_COUNT: int = 16
+
+# mmacieje: When nothing fits, tiles that save less than this much more are
+# not worth rendering.
+DIMINISHING_RETURNS: float = 0.05
+
+Pass = Tuple[str, int]
+
+
+def estimate_frame_memory(width: int, height: int, passes: List[Pass], multilayer: bool, spatial_sample_count: int, temporal_sample_count: int, tile_count: int = 1, overlap_ratio: float = 0.0) -> int:
+    # mmacieje: `passes` holds `(deferred_pass, material_count)` pairs; every
+    # pass renders its main layer plus one per material.
+    tile_width = width / tile_count * (1.0 + 2.0 * overlap_ratio)
+    tile_height = height / tile_count * (1.0 + 2.0 * overlap_ratio)
+    tile_pixels = int(tile_width * tile_height)
+    frame_pixels = width * height
+    layer_count = sum(1 + material_count for _deferred_pass, material_count in passes)
+
+    render_targets = sum(tile_pixels * (RENDER_TARGET_BYTES_PER_PIXEL.get(deferred_pass, RENDER_TARGET_BYTES_PER_PIXEL["base"]) + material_count * MATERIAL_BYTES_PER_PIXEL) for deferred_pass, material_count in passes)
+    accumulators = frame_pixels * layer_count * ACCUMULATOR_BYTES_PER_PIXEL if spatial_sample_count * temporal_sample_count > 1 or tile_count > 1 else 0
+    outputs = frame_pixels * layer_count * OUTPUT_BYTES_PER_PIXEL * (2 if multilayer else 1)
+    return render_targets + accumulators + outputs
+
+
+def choose_tiling(width: int, height: int, passes: List[Pass], multilayer: bool, spatial_sample_count: int, temporal_sample_count: int, memory_budget: int) -> Tuple[int, float, int, bool]:
+    # mmacieje: The fewest tiles that fit `memory_budget` (in bytes), as
+    # every extra tile renders its overlap again. Returns the tile count, the
+    # overlap ratio, the estimate and whether it fits at all.
+    estimates: List[int] = []
+    for tile_count in range(1, MAX_TILE_COUNT + 1):
+        overlap_ratio = OVERLAP_RATIO if tile_count > 1 else 0.0
+        estimates.append(estimate_frame_memory(width, height, passes, multilayer, spatial_sample_count, temporal_sample_count, tile_count, overlap_ratio))
+        if estimates[-1] <= memory_budget:
+            return tile_count, overlap_ratio, estimates[-1], True
+
+    # mmacieje: Full-resolution buffers alone are over budget, so no tiling
+    # fits; stop adding tiles once they no longer make a difference.
+    tile_count = next(tile_count for tile_count, estimate in enumerate(estimates, start=1) if estimate <= estimates[-1] * (1.0 + DIMINISHING_RETURNS))
+    return tile_count, OVERLAP_RATIO if tile_count > 1 else 0.0, estimates[tile_count - 1], False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Estimate render-target memory of a frame and pick a tiling that fits a budget.")
+    parser.add_argument("width", type=int)
+    parser.add_argument("height", type=int)
+    parser.add_argument("--deferred-pass", nargs="+", default=["base"], help="one or more passes rendered together")
+    parser.add_argument("--materials", type=int, default=0, help="how many post-process materials each pass has")
+    parser.add_argument("--multilayer", action="store_true")
+    parser.add_argument("--spatial-sample-count", type=int, default=1)
+    parser.add_argument("--temporal-sample-count", type=int, default=1)
+    parser.add_argument("--memory-budget", type=int, required=True, help="in MiB")
+    args = parser.parse_args()
+
+    passes: List[Pass] = [(deferred_pass.lower(), args.materials) for deferred_pass in args.deferred_pass]
+    tile_count, overlap_ratio, estimate, fits = choose_tiling(args.width, args.height, passes, args.multilayer, args.spatial_sample_count, args.temporal_sample_count, args.memory_budget * MIB)
+    print(f"{tile_count}x{tile_count} tile(s), {overlap_ratio:.2f} overlap: {estimate / MIB:.0f} MiB of {args.memory_budget} MiB ({'fits' if fits else 'does not fit'})")
+    return 0 if fits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
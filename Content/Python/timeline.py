@@ -0,0 +1,118 @@
+from typing import Any, Dict, List, Optional
+import json
+import os
+import platform
+import sys
+import time
+
+# NOTE(mmacieje): Startup timeline of the editor process, from the moment it
+# was started until the first frame is produced. `kickoff.py` and
+# `HostExecutor` mark phases as they reach them; since the interpreter is
+# long-running (see the note in `kickoff.py`), marks are kept in this module's
+# namespace and only the first time a phase is reached counts. Once written,
+# the timeline lands next to the first job's frames and is appended to a
+# history file that can be summarised across runs by running this module:
+#
+#     python timeline.py path/to/project/Saved/MovieRenders/Timelines.jsonl
+#
+
+EDITOR_START: str = "editor_start"
+REGISTRY_READY: str = "registry_ready"
+EXECUTOR_CREATED: str = "executor_created"
+MAP_READY: str = "map_ready"
+PIE_STARTED: str = "pie_started"
+FIRST_FRAME: str = "first_frame"
+
+PHASES = (EDITOR_START, REGISTRY_READY, EXECUTOR_CREATED, MAP_READY, PIE_STARTED, FIRST_FRAME)
+
+marks: Dict[str, float] = {}
+written: bool = False
+
+
+def process_start_time() -> Optional[float]:
+    # mmacieje: When this very process was started, as a Unix timestamp.
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(exit_), ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        # mmacieje: 100 ns intervals since 1601-01-01
+        return ((creation.dwHighDateTime << 32) + creation.dwLowDateTime) / 10_000_000 - 11_644_473_600
+
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # mmacieje: The command name may contain spaces, hence `rsplit`.
+            start_ticks = int(stat_file.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/stat") as stat_file:
+            boot_time = next(int(line.split()[1]) for line in stat_file if line.startswith("btime"))
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, StopIteration, ValueError, IndexError):
+        return None
+
+
+def mark(phase: str) -> None:
+    marks.setdefault(phase, time.time())
+
+
+def has(phase: str) -> bool:
+    return phase in marks
+
+
+def durations(timestamps: Dict[str, float]) -> Dict[str, float]:
+    # mmacieje: How long each phase took, i.e. the time from the previous
+    # phase that was reached.
+    result: Dict[str, float] = {}
+    previous: Optional[float] = None
+    for phase in PHASES:
+        if phase not in timestamps:
+            continue
+        if previous is not None:
+            result[phase] = timestamps[phase] - previous
+        previous = timestamps[phase]
+    return result
+
+
+def write(output_directory: str, history_path: str) -> Dict[str, Any]:
+    global written
+    written = True
+
+    timestamps: Dict[str, float] = dict(marks)
+    editor_started_at = process_start_time()
+    if editor_started_at is not None:
+        timestamps[EDITOR_START] = editor_started_at
+
+    record: Dict[str, Any] = {
+        "node": platform.node(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(min(timestamps.values()))) if timestamps else "",
+        "timestamps": timestamps,
+        "durations": durations(timestamps),
+    }
+
+    os.makedirs(output_directory, exist_ok=True)
+    with open(os.path.join(output_directory, "startup_timeline.json"), "w") as timeline_file:
+        json.dump(record, timeline_file, indent=4)
+
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    with open(history_path, "a") as history_file:
+        history_file.write(json.dumps(record) + "\n")
+    return record
+
+
+def summarise(history_path: str) -> List[str]:
+    lines: List[str] = ["started_at           node                 " + " ".join(f"{phase:>16}" for phase in PHASES[1:])]
+    with open(history_path) as history_file:
+        for line in history_file:
+            record = json.loads(line)
+            phase_durations = record.get("durations", {})
+            cells = " ".join(f"{phase_durations[phase]:16.2f}" if phase in phase_durations else f"{'-':>16}" for phase in PHASES[1:])
+            lines.append(f"{record.get('started_at', ''):20} {record.get('node', '')[:20]:20} {cells}")
+    return lines
+
+
+if __name__ == "__main__":
+    for summary_line in summarise(sys.argv[1]):
+        print(summary_line)
@@ -0,0 +1,96 @@
+from typing import Any, Dict, List
+import json
+import os
+import statistics
+import tempfile
+import time
+
+# NOTE(mmacieje): Warm-up calibration. `EngineWarmUpCount` and
+# `RenderWarmUpCount` default to 101 and 97 whatever the scene, which on short
+# shots costs more than the frames themselves. With `-CalibrateWarmUp`,
+# `HostExecutor` times every warm-up tick of a job; streaming and shader
+# compilation show up as long ticks, so the count after which tick times stop
+# exceeding those at the end of warm-up, plus a margin, is what the scene
+# really needs. The counts are cached per map, Sequence and engine version
+# (`{project_dir}/Saved/MovieRenders/WarmUpCache.json`) and used by later jobs
+# that do not give the counts explicitly. Like `telemetry.py`, this module
+# does not import `unreal`; it is fed once per tick and must stay cheap.
+
+# mmacieje: Ticks at the very end of warm-up the others are compared against
+SETTLED_WINDOW: int = 8
+
+# mmacieje: How much slower than the settled ones a tick may be and still
+# count as settled.
+SETTLED_TOLERANCE: float = 0.25
+
+SAFETY_MARGIN: float = 0.25
+
+# mmacieje: Frame time says nothing about temporal history (eye adaptation,
+# Lumen, motion blur), which always needs a few rendered frames.
+MIN_ENGINE_WARM_UP_COUNT: int = 4
+MIN_RENDER_WARM_UP_COUNT: int = 8
+
+
+def cache_key(map_ref: str, sequence_ref: str, engine_version: str) -> str:
+    # mmacieje: Package names, so that `/Game/Maps/Map` and
+    # `/Game/Maps/Map.Map` are the same map.
+    return "|".join((map_ref.split(".", 1)[0], sequence_ref.split(".", 1)[0], engine_version))
+
+
+def load_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path) as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: str, cache: Dict[str, Any]) -> None:
+    # mmacieje: Write-then-rename, just like the resume ledger, only through a
+    # temporary file of our own, as `shard.py` workers may finish at once.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    with os.fdopen(fd, "w") as cache_file:
+        json.dump(cache, cache_file, indent=4, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def settled_count(tick_durations: List[float], configured_count: int, min_count: int) -> int:
+    # mmacieje: Without a settled tail to compare against, or if the very
+    # last ticks are still slow, the configured count is the best we know.
+    if len(tick_durations) < 2 * SETTLED_WINDOW:
+        return configured_count
+    threshold = statistics.median(tick_durations[-SETTLED_WINDOW:]) * (1.0 + SETTLED_TOLERANCE)
+
+    first_settled_idx: int = len(tick_durations)
+    while first_settled_idx > 0 and tick_durations[first_settled_idx - 1] <= threshold:
+        first_settled_idx -= 1
+    if first_settled_idx > len(tick_durations) - SETTLED_WINDOW:
+        return configured_count
+
+    return min(configured_count, max(min_count, int(first_settled_idx * (1.0 + SAFETY_MARGIN)) + 1))
+
+
+class Calibration:
+    def __init__(self, key: str, engine_warm_up_count: int, render_warm_up_count: int) -> None:
+        self.key: str = key
+        self.engine_warm_up_count: int = engine_warm_up_count
+        self.render_warm_up_count: int = render_warm_up_count
+        self.engine_tick_durations: List[float] = []
+        self.render_tick_durations: List[float] = []
+        self.last_tick_at: float = 0.0
+
+    def record(self, engine_warming_up: bool) -> None:
+        now = time.perf_counter()
+        if self.last_tick_at:
+            (self.engine_tick_durations if engine_warming_up else self.render_tick_durations).append(now - self.last_tick_at)
+        self.last_tick_at = now
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "engine_warm_up_count": settled_count(self.engine_tick_durations, self.engine_warm_up_count, MIN_ENGINE_WARM_UP_COUNT),
+            "render_warm_up_count": settled_count(self.render_tick_durations, self.render_warm_up_count, MIN_RENDER_WARM_UP_COUNT),
+            "measured_engine_ticks": len(self.engine_tick_durations),
+            "measured_render_ticks": len(self.render_tick_durations),
+            "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
@@ -0,0 +1,54 @@
+from typing import Dict, List
+import os
+import sys
+
+# NOTE(mmacieje): Stands in for `UnrealEditor-Cmd` in `test_shard.py`. It
+# understands the command line `shard.py` builds, writes a dummy frame (and a
+# `checksum` sidecar, just like `postprocess.py` would) for every frame of its
+# slice and every deferred pass, and exits. On top of that:
+#
+#     -FakeOutputDirectory=...  where to write, as it knows nothing of projects
+#     -FakeFailOnce=...         a directory; the first attempt of every shard
+#                               leaves a marker there and fails without a frame
+#     -FakeSkipFrames=13+14     frames never written, whatever the attempt
+
+
+def parse_args(argv: List[str]) -> Dict[str, str]:
+    args: Dict[str, str] = {}
+    for arg in argv:
+        if arg.startswith("-") and "=" in arg:
+            name, value = arg[1:].split("=", 1)
+            args[name] = value
+    return args
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    start_frame = int(args["StartFrame"])
+    end_frame = int(args["EndFrame"])
+
+    fail_once_dir = args.get("FakeFailOnce", "")
+    if fail_once_dir:
+        marker_path = os.path.join(fail_once_dir, f"{start_frame}_{end_frame}")
+        if not os.path.exists(marker_path):
+            os.makedirs(fail_once_dir, exist_ok=True)
+            open(marker_path, "w").close()
+            return 3
+
+    skipped_frames = {int(frame) for frame in args.get("FakeSkipFrames", "").split("+") if frame}
+    render_passes = [item.split(":", 1)[0].strip().lower() for item in args.get("DeferredPass", "Base").split(",") if item.strip()]
+    for render_pass in render_passes:
+        render_pass_dir = os.path.join(args["FakeOutputDirectory"], render_pass)
+        os.makedirs(render_pass_dir, exist_ok=True)
+        for frame in range(start_frame, end_frame):
+            if frame in skipped_frames:
+                continue
+            with open(os.path.join(render_pass_dir, f"{frame:04d}.exr"), "w") as frame_file:
+                frame_file.write(f"{render_pass} {frame}")
+            with open(os.path.join(render_pass_dir, f"{frame:04d}.exr.sha256"), "w") as checksum_file:
+                checksum_file.write("0" * 64)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,95 @@
+from typing import List
+import os
+import stat
+import sys
+
+TESTS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "Content", "Python"))
+
+import pytest  # noqa: E402
+import shard  # noqa: E402
+
+# NOTE(mmacieje): Drives `shard.main` end to end against `fake_editor.py`,
+# i.e. real processes, real retries and real frames on disk, only no engine.
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(shard, "POLL_INTERVAL", 0.01)
+
+
+def fake_editor(tmp_path: str) -> str:
+    # mmacieje: `--editor` is a single executable, just like the real one.
+    fake_editor_path = os.path.join(TESTS_DIR, "fake_editor.py")
+    if sys.platform == "win32":
+        editor_path = os.path.join(tmp_path, "UnrealEditor-Cmd.bat")
+        with open(editor_path, "w") as editor_file:
+            editor_file.write(f'@"{sys.executable}" "{fake_editor_path}" %*\n')
+    else:
+        editor_path = os.path.join(tmp_path, "UnrealEditor-Cmd")
+        with open(editor_path, "w") as editor_file:
+            editor_file.write(f'#!/bin/sh\nexec "{sys.executable}" "{fake_editor_path}" "$@"\n')
+        os.chmod(editor_path, os.stat(editor_path).st_mode | stat.S_IXUSR)
+    return editor_path
+
+
+def run(tmp_path: str, fake_args: List[str], retries: int = 2) -> int:
+    output_directory = os.path.join(tmp_path, "MovieRenders")
+    return shard.main([
+        "--editor", fake_editor(tmp_path),
+        "--project", os.path.join(tmp_path, "Project.uproject"),
+        "--sequence", "/Game/Shots/Shot.Shot",
+        "--start-frame", "0",
+        "--end-frame", "40",
+        "--workers", "3",
+        "--min-shard-length", "10",
+        "--retries", str(retries),
+        "--deferred-pass", "Base,LightingOnly",
+        "--output-directory", output_directory,
+        "--log-directory", os.path.join(tmp_path, "Logs"),
+        "--",
+        f"-FakeOutputDirectory={output_directory}",
+    ] + fake_args)
+
+
+def test_every_frame_once(tmp_path: str) -> None:
+    assert run(str(tmp_path), []) == 0
+    for render_pass in ("base", "lightingonly"):
+        assert len([name for name in os.listdir(os.path.join(tmp_path, "MovieRenders", render_pass)) if name.endswith(".exr")]) == 40
+
+
+def test_sidecars_are_not_duplicates(tmp_path: str) -> None:
+    assert run(str(tmp_path), []) == 0
+    assert shard.verify_frames(os.path.join(tmp_path, "MovieRenders"), 0, 40) == []
+
+
+def test_proxies_are_not_render_passes(tmp_path: str) -> None:
+    assert run(str(tmp_path), []) == 0
+    # mmacieje: As the documented `proxy` step of `postprocess.py` has it
+    proxy_dir = os.path.join(tmp_path, "MovieRenders", "base", "proxy")
+    os.makedirs(proxy_dir)
+    for frame in range(2):
+        open(os.path.join(proxy_dir, f"{frame:04d}.jpg"), "w").close()
+    assert shard.verify_frames(os.path.join(tmp_path, "MovieRenders"), 0, 40) == []
+
+
+def test_failed_shards_are_retried(tmp_path: str) -> None:
+    assert run(str(tmp_path), [f"-FakeFailOnce={os.path.join(tmp_path, 'Failed')}"]) == 0
+    assert len(os.listdir(os.path.join(tmp_path, "Failed"))) == 3
+    assert len(os.listdir(os.path.join(tmp_path, "Logs"))) == 6
+
+
+def test_retries_run_out(tmp_path: str) -> None:
+    assert run(str(tmp_path), [f"-FakeFailOnce={os.path.join(tmp_path, 'Failed')}"], retries=0) == 1
+
+
+def test_missing_frames_fail(tmp_path: str, capsys: pytest.CaptureFixture) -> None:
+    assert run(str(tmp_path), ["-FakeSkipFrames=13+14"]) == 1
+    assert "missing 2 frame(s): 13-14" in capsys.readouterr().err
+
+
+def test_cut_into_shards() -> None:
+    assert shard.cut_into_shards(0, 40, 3, 10) == [(0, 14), (14, 27), (27, 40)]
+    assert shard.cut_into_shards(0, 40, 8, 101) == [(0, 40)]
+    with pytest.raises(ValueError):
+        shard.cut_into_shards(10, 10, 2, 1)
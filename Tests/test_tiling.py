@@ -0,0 +1,50 @@
+import os
+import sys
+
+TESTS_DIR: str = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), "Content", "Python"))
+
+import tiling  # noqa: E402
+
+MIB: int = tiling.MIB
+
+
+def test_single_tile_when_it_fits() -> None:
+    estimate = tiling.estimate_frame_memory(1920, 1080, [("base", 1)], False, 1, 1)
+    assert tiling.choose_tiling(1920, 1080, [("base", 1)], False, 1, 1, estimate) == (1, 0.0, estimate, True)
+
+
+def test_fewest_tiles_that_fit() -> None:
+    passes = [("base", 1)]
+    estimates = [tiling.estimate_frame_memory(15360, 8640, passes, False, 1, 8, tile_count, tiling.OVERLAP_RATIO if tile_count > 1 else 0.0) for tile_count in range(1, 5)]
+    # mmacieje: Just enough for three tiles, not quite enough for two
+    tile_count, overlap_ratio, estimate, fits = tiling.choose_tiling(15360, 8640, passes, False, 1, 8, estimates[2])
+    assert (tile_count, overlap_ratio, estimate, fits) == (3, tiling.OVERLAP_RATIO, estimates[2], True)
+    assert estimates[1] > estimates[2]
+
+
+def test_over_budget_stops_at_diminishing_returns() -> None:
+    # mmacieje: Full-resolution buffers alone are over 1 MiB.
+    tile_count, _overlap_ratio, estimate, fits = tiling.choose_tiling(15360, 8640, [("base", 0)], False, 1, 8, MIB)
+    assert not fits
+    assert 1 < tile_count < tiling.MAX_TILE_COUNT
+    floor = tiling.estimate_frame_memory(15360, 8640, [("base", 0)], False, 1, 8, tiling.MAX_TILE_COUNT, tiling.OVERLAP_RATIO)
+    assert estimate <= floor * (1.0 + tiling.DIMINISHING_RETURNS)
+
+
+def test_multilayer_doubles_outputs() -> None:
+    single = tiling.estimate_frame_memory(1920, 1080, [("base", 2)], False, 1, 1)
+    multilayer = tiling.estimate_frame_memory(1920, 1080, [("base", 2)], True, 1, 1)
+    assert multilayer - single == 1920 * 1080 * 3 * tiling.OUTPUT_BYTES_PER_PIXEL
+
+
+def test_accumulators_only_with_several_samples() -> None:
+    one_sample = tiling.estimate_frame_memory(1920, 1080, [("base", 0)], False, 1, 1)
+    assert tiling.estimate_frame_memory(1920, 1080, [("base", 0)], False, 2, 1) - one_sample == 1920 * 1080 * tiling.ACCUMULATOR_BYTES_PER_PIXEL
+    assert tiling.estimate_frame_memory(1920, 1080, [("base", 0)], False, 1, 8) == tiling.estimate_frame_memory(1920, 1080, [("base", 0)], False, 4, 2)
+
+
+def test_every_pass_adds_up() -> None:
+    base = tiling.estimate_frame_memory(1920, 1080, [("base", 0)], False, 1, 1)
+    lighting_only = tiling.estimate_frame_memory(1920, 1080, [("lightingonly", 0)], False, 1, 1)
+    assert tiling.estimate_frame_memory(1920, 1080, [("base", 0), ("lightingonly", 0)], False, 1, 1) == base + lighting_only